@@ -0,0 +1,428 @@
+"""
+EC2 instance state change module.
+
+This module provides the shared flow behind starting and stopping EC2
+instances by their name tag across multiple AWS accounts: search, state
+checks, dry-run, confirmation, the API call and the optional wait.
+"""
+
+import io
+import logging
+import sys
+from typing import Dict, Any, List, Optional, TextIO
+
+# ec2.find, ec2.waiters and botocore are imported where they are first used,
+# so importing the start/stop commands does not pay for loading boto3
+from libs.describe_batcher import InstanceNameBatcher
+from libs.get_confirmation import get_confirmation
+
+logger = logging.getLogger('aws-automation-tamer.ec2.action')
+
+# Everything that differs between starting and stopping an instance. 'states'
+# maps each instance state to the handler in _STATE_HANDLERS that deals with
+# it; states not listed cannot be acted on.
+ACTIONS: Dict[str, Dict[str, Any]] = {
+    'start': {
+        'verb': 'start',
+        'verbing': 'starting',
+        'past_participle': 'started',
+        'icon': '🚀',
+        'api': 'start_instances',
+        'target_state': 'running',
+        'states': {
+            'running': 'done',
+            'pending': 'in_progress',
+            'stopped': 'act',
+            'stopping': 'wait_then_act',
+        },
+        'failure_states': ('shutting-down', 'terminated', 'stopping'),
+        'done_message': 'is already running',
+        'in_progress_message': 'is already starting',
+        'reached_message': 'is now fully running',
+    },
+    'stop': {
+        'verb': 'stop',
+        'verbing': 'stopping',
+        'past_participle': 'stopped',
+        'icon': '🛑',
+        'api': 'stop_instances',
+        'target_state': 'stopped',
+        'states': {
+            'stopped': 'done',
+            'stopping': 'in_progress',
+            'running': 'act',
+            'pending': 'act',
+        },
+        'failure_states': ('pending', 'terminated'),
+        'done_message': 'is already stopped',
+        'in_progress_message': 'is already stopping',
+        'reached_message': 'has fully stopped',
+    },
+}
+
+
+def perform_instance_action(action: str, server_name: str, config: Dict[str, Any],
+                            wait: bool = False, dry_run: bool = False,
+                            auto_confirm: bool = False,
+                            max_workers: Optional[int] = None,
+                            regions: Optional[List[str]] = None,
+                            batcher: Optional[InstanceNameBatcher] = None,
+                            instance_id: Optional[str] = None,
+                            account: Optional[str] = None,
+                            region: Optional[str] = None) -> bool:
+    """
+    Start or stop an EC2 instance by finding it across all configured accounts.
+    
+    When instance_id, account and region are all given, the search is skipped
+    and the instance is looked up directly.
+    
+    Args:
+        action: Either 'start' or 'stop'
+        server_name: The name tag value to search for
+        config: Configuration dictionary containing AWS accounts
+        wait: If True, wait for the instance to reach its target state before returning
+        dry_run: If True, perform a dry-run without changing the instance
+        auto_confirm: If True, skip confirmation prompts
+        max_workers: Maximum concurrent account/region probes during the search
+        regions: Regions to search instead of the configured ones
+        batcher: Optional batcher to coalesce the search with concurrent lookups
+        instance_id: Known instance ID, used together with account and region
+        account: Account name or ID holding the instance
+        region: Region holding the instance
+        
+    Returns:
+        bool: True if the action was successful or unnecessary, False otherwise
+        
+    Raises:
+        ValueError: If action is not a known action
+    """
+    if action not in ACTIONS:
+        raise ValueError(f"Unknown instance action: {action}")
+    
+    spec = ACTIONS[action]
+    verb = spec['verb']
+    
+    logger.info(f"Attempting to {verb} instance: {server_name}")
+    
+    known = bool(instance_id and account and region)
+    if known:
+        sys.stdout.write(f"🔍 Looking up EC2 instance: {server_name}\n"
+                         f"   Checking {instance_id} in account {account}, region {region}...\n")
+    else:
+        sys.stdout.write(f"🔍 Searching for EC2 instance: {server_name}\n"
+                         "   Checking all configured accounts and regions...\n")
+    sys.stdout.flush()
+    
+    # Output is buffered and written once per phase (found, confirm, result)
+    out = io.StringIO()
+    try:
+        from ec2.find import find_instance_by_id, find_instance_with_session, report_instance_not_found
+        
+        if known:
+            result = find_instance_by_id(instance_id, account, region, config)
+            if result is None:
+                _tell(out, logging.WARNING, f"Instance {instance_id} not found in account {account}, region {region}", "\n❌ ")
+                return False
+        else:
+            result = find_instance_with_session(server_name, config, max_workers=max_workers,
+                                                regions=regions, batcher=batcher)
+            if result is None:
+                report_instance_not_found(server_name, config, regions=regions)
+                return False
+        
+        account_name, region, instance_data, ec2_client = result
+        instance_id = instance_data.get('InstanceId')
+        
+        if not instance_id:
+            _tell(out, logging.ERROR, "Instance data is missing Instance ID", "\n❌ ",
+                  log_message=f"Instance data is missing Instance ID for {server_name}")
+            return False
+            
+        instance_state = instance_data.get('State', {}).get('Name', 'unknown')
+        label = f"{server_name} ({instance_id})"
+        
+        out.write(f"\n✅ Found EC2 instance: {server_name}\n"
+                  f"   Located in account: {account_name}, region: {region}\n"
+                  f"   Instance ID: {instance_id}\n"
+                  f"   Current state: {instance_state.upper()}\n")
+        
+        # Dispatch on the current state; handlers return None to proceed
+        handler = _STATE_HANDLERS[spec['states'].get(instance_state, 'unactionable')]
+        outcome = handler(spec, instance_state, ec2_client, instance_id, label, out, wait, auto_confirm)
+        if outcome is not None:
+            return outcome
+        
+        # Instance is in an actionable state, proceed
+        if dry_run:
+            _tell(out, logging.INFO, f"DRY RUN: Would {verb} instance {label}", "\n🔍 ")
+            out.write("   No actual changes will be made.\n")
+            return True
+        
+        # Ask for confirmation unless auto-confirm is enabled
+        if not auto_confirm:
+            out.write(f"\n⚠️  This will {verb} the EC2 instance:\n"
+                      f"   Instance: {label}\n"
+                      f"   Account: {account_name}\n"
+                      f"   Region: {region}\n")
+            _flush_output(out)
+            
+            if not get_confirmation(f"Are you sure you want to {verb} this instance?"):
+                _tell(out, logging.INFO, "Operation cancelled.", "❌ ",
+                      log_message=f"{verb.capitalize()} operation cancelled for instance {label}.")
+                return False
+        
+        # Perform the action
+        _tell(out, logging.INFO, f"{spec['verbing'].capitalize()} instance {label}...", f"\n{spec['icon']} ",
+              log_message=f"{spec['verbing'].capitalize()} instance {label} in account {account_name}, region {region}.")
+        _flush_output(out)
+        
+        from botocore.exceptions import ClientError
+        
+        try:
+            response = getattr(ec2_client, spec['api'])(InstanceIds=[instance_id])
+            logger.debug("%s request sent for instance %s. Response: %s", verb.capitalize(), label, response)
+            
+            out.write(f"✅ {verb.capitalize()} request sent successfully for instance {label}\n")
+            
+            if wait:
+                out.write(f"⏳ Waiting for instance to fully {verb}...\n")
+                _flush_output(out)
+                return _wait_for_target_state(spec, ec2_client, instance_id, label)
+            else:
+                out.write(f"   Use --wait option to wait for the instance to fully {verb}.\n")
+                return True
+                
+        except ClientError as e:
+            error_code = e.response.get('Error', {}).get('Code', 'Unknown')
+            error_message = e.response.get('Error', {}).get('Message', str(e))
+            _tell(out, logging.ERROR, f"Failed to {verb} instance {label}\n   Error: {error_code} - {error_message}",
+                  "\n❌ ", log_message=f"Failed to {verb} instance {label}: {error_code} - {error_message}")
+            return False
+        except Exception as e:
+            _tell(out, logging.ERROR, f"Unexpected error {spec['verbing']} instance {label}: {e}", "\n❌ ",
+                  exc_info=True)
+            return False
+            
+    except Exception as e:
+        _tell(out, logging.ERROR, f"Error finding or {spec['verbing']} instance: {e}", "\n❌ ",
+              log_message=f"Error in {verb}_instance_by_name for {server_name}: {e}", exc_info=True)
+        return False
+    finally:
+        _flush_output(out)
+
+
+def plan_instance_action(action: str, server_name: str, config: Dict[str, Any],
+                         max_workers: Optional[int] = None,
+                         regions: Optional[List[str]] = None) -> bool:
+    """
+    Show what starting or stopping would do for every instance with a name tag.
+    
+    Unlike a dry run of perform_instance_action, which stops at the first match,
+    this searches every account and region in parallel and reports each match as
+    it comes in, followed by a summary. Nothing is changed.
+    
+    Args:
+        action: Either 'start' or 'stop'
+        server_name: The name tag value to search for
+        config: Configuration dictionary containing AWS accounts
+        max_workers: Maximum concurrent account/region probes during the search
+        regions: Regions to search instead of the configured ones
+        
+    Returns:
+        bool: True if at least one instance was found, False otherwise
+        
+    Raises:
+        ValueError: If action is not a known action
+    """
+    if action not in ACTIONS:
+        raise ValueError(f"Unknown instance action: {action}")
+    
+    spec = ACTIONS[action]
+    verb = spec['verb']
+    
+    logger.info(f"Planning {verb} for instances named: {server_name}")
+    
+    sys.stdout.write(f"🔍 DRY RUN: Planning {verb} for EC2 instances named: {server_name}\n"
+                     "   Checking all configured accounts and regions...\n")
+    sys.stdout.flush()
+    
+    from ec2.find import iter_instances_by_name, report_instance_not_found
+    
+    counts = {'change': 0, 'unchanged': 0, 'blocked': 0}
+    for account_name, region, instance_data, _ in iter_instances_by_name(server_name, config,
+                                                                         max_workers=max_workers,
+                                                                         regions=regions):
+        if not any(counts.values()):
+            sys.stdout.write("\n")
+        
+        instance_state = instance_data.get('State', {}).get('Name', 'unknown')
+        outcome = spec['states'].get(instance_state, 'unactionable')
+        if outcome in ('act', 'wait_then_act'):
+            counts['change'] += 1
+            verdict = f"would {verb}"
+        elif outcome == 'unactionable':
+            counts['blocked'] += 1
+            verdict = f"cannot be {spec['past_participle']}"
+        else:
+            counts['unchanged'] += 1
+            verdict = spec['done_message'] if outcome == 'done' else spec['in_progress_message']
+        
+        sys.stdout.write(f"   • {account_name} / {region}: {instance_data.get('InstanceId')} "
+                         f"[{instance_state.upper()}] → {verdict}\n")
+        sys.stdout.flush()
+    
+    if not any(counts.values()):
+        report_instance_not_found(server_name, config, regions=regions)
+        return False
+    
+    sys.stdout.write(f"\n📋 Plan: {counts['change']} would {verb}, {counts['unchanged']} unchanged, "
+                     f"{counts['blocked']} cannot be {spec['past_participle']}\n"
+                     "   No actual changes will be made.\n")
+    logger.info(f"DRY RUN plan for {server_name}: {counts}")
+    return True
+
+
+def _flush_output(out: io.StringIO) -> None:
+    """
+    Write buffered output to stdout in one call and empty the buffer.
+    
+    Args:
+        out: Buffer holding the pending output
+    """
+    if out.tell():
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
+        out.seek(0)
+        out.truncate()
+
+
+def _tell(out: TextIO, level: int, message: str, prefix: str,
+          log_message: Optional[str] = None, exc_info: bool = False) -> None:
+    """
+    Show a message to the user and log it, formatting it only once.
+    
+    Args:
+        out: Stream or buffer the user-facing line is written to
+        level: Logging level for the log record
+        message: Message text, shared by the output and the log
+        prefix: Text put before the message in the output (newline, icon)
+        log_message: Different text for the log, if the log needs more context
+        exc_info: If True, attach the current exception to the log record
+    """
+    out.write(f"{prefix}{message}\n")
+    logger.log(level, log_message if log_message is not None else message, exc_info=exc_info)
+
+
+def _already_done(spec: Dict[str, Any], instance_state: str, ec2_client, instance_id: str,
+                  label: str, out: io.StringIO, wait: bool, auto_confirm: bool) -> Optional[bool]:
+    """Report that the instance is already in the target state."""
+    _tell(out, logging.INFO, f"Instance {label} {spec['done_message']}.", "\n✅ ")
+    return True
+
+
+def _already_in_progress(spec: Dict[str, Any], instance_state: str, ec2_client, instance_id: str,
+                         label: str, out: io.StringIO, wait: bool, auto_confirm: bool) -> Optional[bool]:
+    """Report that the instance is already heading to the target state, waiting if asked to."""
+    _tell(out, logging.INFO, f"Instance {label} {spec['in_progress_message']}.", "\n⏳ ")
+    if wait:
+        out.write(f"   Waiting for instance to fully {spec['verb']}...\n")
+        _flush_output(out)
+        return _wait_for_target_state(spec, ec2_client, instance_id, label)
+    return True
+
+
+def _act(spec: Dict[str, Any], instance_state: str, ec2_client, instance_id: str,
+         label: str, out: io.StringIO, wait: bool, auto_confirm: bool) -> Optional[bool]:
+    """Let the action go ahead."""
+    return None
+
+
+def _wait_then_act(spec: Dict[str, Any], instance_state: str, ec2_client, instance_id: str,
+                   label: str, out: io.StringIO, wait: bool, auto_confirm: bool) -> Optional[bool]:
+    """Let a stopping instance finish stopping before the action goes ahead."""
+    return None if _wait_until_stopped(ec2_client, instance_id, label, auto_confirm, out) else False
+
+
+def _unactionable(spec: Dict[str, Any], instance_state: str, ec2_client, instance_id: str,
+                  label: str, out: io.StringIO, wait: bool, auto_confirm: bool) -> Optional[bool]:
+    """Report that the action cannot be applied in the current state."""
+    _tell(out, logging.WARNING,
+          f"Instance {label} is in '{instance_state}' state and cannot be {spec['past_participle']}.", "\n⚠️  ")
+    return False
+
+
+_STATE_HANDLERS = {
+    'done': _already_done,
+    'in_progress': _already_in_progress,
+    'act': _act,
+    'wait_then_act': _wait_then_act,
+    'unactionable': _unactionable,
+}
+
+
+def _wait_until_stopped(ec2_client, instance_id: str, label: str, auto_confirm: bool,
+                        out: io.StringIO) -> bool:
+    """
+    Wait for a stopping instance to stop so that it can be started again.
+    
+    Args:
+        ec2_client: boto3 EC2 client
+        instance_id: EC2 instance ID
+        label: Instance label for messages
+        auto_confirm: If True, skip the confirmation prompt
+        out: Buffer for user-facing output, flushed before blocking
+        
+    Returns:
+        bool: True if the instance stopped, False if cancelled, timed out or failed
+    """
+    out.write(f"\n⏳ Instance {label} is currently stopping.\n"
+              "   You may need to wait for it to fully stop before starting.\n")
+    if not auto_confirm:
+        _flush_output(out)
+        if not get_confirmation("Do you want to wait for it to stop and then start it?"):
+            _tell(out, logging.INFO, "Operation cancelled.", "❌ ",
+                  log_message=f"Start operation cancelled for stopping instance {label}.")
+            return False
+    
+    _tell(out, logging.INFO, "Waiting for instance to stop before starting...", "   ",
+          log_message=f"Waiting for instance {label} to stop before starting.")
+    _flush_output(out)
+    try:
+        from ec2.waiters import wait_for_instance_state
+        
+        wait_for_instance_state(ec2_client, instance_id, 'stopped',
+                                timeout=300,  # Wait up to 5 minutes
+                                failure_states=('pending', 'terminated'))
+        _tell(out, logging.INFO, f"Instance {label} has stopped. Now starting...", "✅ ")
+        return True
+    except Exception as e:
+        _tell(out, logging.ERROR, f"Timeout waiting for instance {label} to stop: {e}", "❌ ")
+        return False
+
+
+def _wait_for_target_state(spec: Dict[str, Any], ec2_client, instance_id: str, label: str) -> bool:
+    """
+    Wait for an EC2 instance to reach the target state of an action.
+    
+    Args:
+        spec: Entry from ACTIONS describing the action
+        ec2_client: boto3 EC2 client
+        instance_id: EC2 instance ID
+        label: Instance label for messages
+        
+    Returns:
+        bool: True if the instance reached the target state, False if timeout or error
+    """
+    verb = spec['verb']
+    try:
+        from ec2.waiters import wait_for_instance_state
+        
+        wait_for_instance_state(ec2_client, instance_id, spec['target_state'],
+                                timeout=600,  # Wait up to 10 minutes
+                                failure_states=spec['failure_states'])
+        _tell(sys.stdout, logging.INFO, f"Instance {label} {spec['reached_message']}.", "✅ ")
+        return True
+        
+    except Exception as e:
+        _tell(sys.stdout, logging.ERROR, f"Timeout or error waiting for instance {label} to {verb}: {e}", "❌ ")
+        return False
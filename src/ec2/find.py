@@ -6,22 +6,354 @@ across multiple AWS accounts and regions.
 """
 
 import logging
-from typing import Dict, Any, Optional, Tuple
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 
-from libs.aws_session_manager import AssumeRoleSessionManager, AssumeRoleError
+from libs.aws_clients import get_ec2_client
+from libs.describe_batcher import InstanceNameBatcher, SEARCHABLE_STATES
+from libs.aws_session_manager import AssumeRoleError
 from load_config import get_aws_accounts, get_valid_regions
 from botocore.exceptions import ClientError
 
 logger = logging.getLogger('aws-automation-tamer.ec2.find')
 
+# Upper bound on concurrent account/region probes during a search
+MAX_SEARCH_WORKERS = 32
 
-def find_instance_by_name(server_name: str, config: Dict[str, Any]) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+# Names matching this are treated as instance IDs rather than name tags
+_INSTANCE_ID_RE = re.compile(r'^i-[0-9a-f]{8,17}$')
+
+# Account/region pairs that rejected a search (region not enabled, no access)
+# are skipped by later searches in the same process until this many seconds
+# have passed. AuthFailure is not included: it is often temporary (clock skew,
+# a briefly broken role) and is only logged.
+DEAD_REGION_TTL = 3600
+_DEAD_REGION_ERRORS = frozenset({'UnauthorizedOperation', 'OptInRequired'})
+_dead_regions: Dict[Tuple[str, str], float] = {}
+_dead_regions_lock = threading.Lock()
+
+# Last (config, accounts) pair, so one config is only parsed once per process
+_accounts_cache: Optional[Tuple[Dict[str, Any], Dict[str, str]]] = None
+
+
+def cached_aws_accounts(config: Dict[str, Any]) -> Dict[str, str]:
     """
-    Find an EC2 instance by name tag across all configured accounts.
+    Get the configured AWS accounts, reusing the result for the same config object.
+    
+    The config is expected not to change during the life of the process; a
+    different config object is parsed afresh.
+    
+    Args:
+        config: Configuration dictionary containing AWS accounts
+        
+    Returns:
+        Dictionary mapping account names to account IDs
+    """
+    global _accounts_cache
+    
+    cached = _accounts_cache
+    if cached is not None and cached[0] is config:
+        return cached[1]
+    
+    accounts = get_aws_accounts(config)
+    _accounts_cache = (config, accounts)
+    return accounts
+
+
+def _is_dead_region(account_id: str, region: str) -> bool:
+    """
+    Check whether an account/region pair recently rejected a search.
+    
+    Args:
+        account_id: AWS account ID
+        region: AWS region name
+        
+    Returns:
+        True if the pair should be skipped, False otherwise
+    """
+    with _dead_regions_lock:
+        marked_at = _dead_regions.get((account_id, region))
+    return marked_at is not None and time.time() - marked_at < DEAD_REGION_TTL
+
+
+def _mark_dead_region(account_id: str, region: str) -> None:
+    """
+    Remember that an account/region pair rejected a search.
+    
+    Args:
+        account_id: AWS account ID
+        region: AWS region name
+    """
+    with _dead_regions_lock:
+        _dead_regions[(account_id, region)] = time.time()
+
+
+def count_dead_regions(config: Dict[str, Any], regions: Optional[List[str]] = None) -> int:
+    """
+    Count the account/region pairs a search currently skips as dead.
+    
+    Args:
+        config: Configuration dictionary containing AWS accounts
+        regions: Regions searched instead of the configured ones
+        
+    Returns:
+        Number of skipped account/region pairs
+    """
+    accounts = cached_aws_accounts(config)
+    searched_regions = regions or get_valid_regions(config)
+    return sum(1 for account_id in accounts.values() for region in searched_regions
+               if _is_dead_region(account_id, region))
+
+
+def _instance_region(instance: Dict[str, Any], region: str) -> str:
+    """
+    Determine the region an instance lives in from its availability zone.
+    
+    Args:
+        instance: EC2 instance data from AWS API
+        region: Region the instance was found through
+        
+    Returns:
+        Region name, falling back to the queried region
+    """
+    actual_az = instance.get('Placement', {}).get('AvailabilityZone', '')
+    if not actual_az or actual_az.startswith(region):
+        # The AZ almost always belongs to the queried region
+        return region
+    
+    # Extract region from AZ (e.g., 'eu-central-1a' -> 'eu-central-1')
+    return actual_az[:-1] if actual_az[-1].isalpha() else region
+
+
+def _iter_matching(ec2: Any, server_name: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield instances matching a name tag or instance ID, fetching pages lazily.
+    
+    No page size is requested, so EC2 normally answers in a single call; any
+    NextToken it does return is followed. Pages after the one the caller stops
+    on are never requested.
+    
+    Args:
+        ec2: EC2 client for the account/region to search
+        server_name: The name tag value to search for, or an instance ID (i-...)
+        
+    Yields:
+        EC2 instance data from AWS API
+    """
+    # States an instance can be in and still be found by a search
+    state_filter = {
+        'Name': 'instance-state-name',
+        'Values': list(SEARCHABLE_STATES)
+    }
+    
+    paginator = ec2.get_paginator('describe_instances')
+    
+    if _INSTANCE_ID_RE.match(server_name):
+        # Instance IDs are looked up directly rather than through the tag index
+        pages = paginator.paginate(InstanceIds=[server_name], Filters=[state_filter])
+    else:
+        # Search for instances with the specified name tag. No page size is set:
+        # filtered pages can come back empty with a NextToken, so a sized page
+        # would cost extra round trips in every region without a match.
+        pages = paginator.paginate(
+            Filters=[
+                {
+                    'Name': 'tag:Name',
+                    'Values': [server_name]
+                },
+                state_filter
+            ]
+        )
+    
+    for page in pages:
+        for reservation in page['Reservations']:
+            yield from reservation['Instances']
+
+
+def _search_one(server_name: str, account_id: str, account_name: str, region: str,
+                first_only: bool = True,
+                batcher: Optional[InstanceNameBatcher] = None) -> List[Tuple[str, str, Dict[str, Any], Any]]:
+    """
+    Search a single account/region pair for instances with the given name tag.
+    
+    Runs inside a worker thread, so every error is logged and swallowed here
+    rather than propagated to the caller.
     
     Args:
         server_name: The name tag value to search for
+        account_id: AWS account ID to search
+        account_name: Configured name of the account (for logging and results)
+        region: AWS region to search
+        first_only: If True, stop at the first matching instance
+        batcher: Optional batcher to coalesce name lookups with concurrent callers
+        
+    Returns:
+        List of (account_name, region, instance_data, ec2_client) tuples, empty if none found
+    """
+    logger.debug("Searching in account %s, region: %s", account_name, region)
+    
+    try:
+        # Get (possibly cached) EC2 client for this specific region
+        ec2 = get_ec2_client(account_id, region)
+        
+        if batcher is not None and not _INSTANCE_ID_RE.match(server_name):
+            # Share one DescribeInstances call with concurrent lookups in this account/region
+            instances = iter(batcher.lookup(ec2, account_id, region, server_name).result())
+        else:
+            instances = _iter_matching(ec2, server_name)
+        if first_only:
+            instances = islice(instances, 1)
+        
+        matches = []
+        for instance in instances:
+            actual_region = _instance_region(instance, region)
+            logger.info(f"Found instance {instance['InstanceId']} in account {account_name}, region {actual_region}")
+            matches.append((account_name, actual_region, instance, ec2))
+        return matches
+            
+    except ClientError as e:
+        # Log but continue - some regions might not be accessible
+        error_code = e.response.get('Error', {}).get('Code', 'Unknown')
+        if error_code in _DEAD_REGION_ERRORS:
+            # Typically permanent (region not opted in); skip it on later searches
+            _mark_dead_region(account_id, region)
+            logger.warning(f"Skipping account {account_name}, region {region} for the next "
+                           f"{DEAD_REGION_TTL // 60} minutes after {error_code}")
+        elif error_code != 'InvalidInstanceID.NotFound':
+            logger.warning(f"Error searching in region {region}: {error_code}")
+    except AssumeRoleError as e:
+        logger.error(f"Failed to assume role in account {account_name}: {e}")
+    except Exception as e:
+        logger.error(f"Unexpected error in account {account_name}: {e}")
+    
+    return []
+
+
+def _iter_search(server_name: str, config: Dict[str, Any], first_only: bool,
+                 max_workers: Optional[int] = None,
+                 regions: Optional[List[str]] = None,
+                 batcher: Optional[InstanceNameBatcher] = None,
+                 ordered: bool = False) -> Iterator[Tuple[str, str, Dict[str, Any], Any]]:
+    """
+    Search all configured accounts and regions concurrently, yielding matches as they arrive.
+    
+    One task is submitted per (account, region) pair. Closing the generator
+    cancels every task that has not started yet.
+    
+    Args:
+        server_name: The name tag value to search for
+        config: Configuration dictionary containing AWS accounts
+        first_only: If True, each task reports at most one instance
+        max_workers: Maximum concurrent probes (defaults to MAX_SEARCH_WORKERS)
+        regions: Regions to search instead of the configured ones
+        batcher: Optional batcher to coalesce name lookups with concurrent callers
+        ordered: If True, yield matches in configuration order (accounts, then
+            regions); a match is only yielded once every earlier pair has finished
+        
+    Yields:
+        Tuples of (account_name, region, instance_data, ec2_client)
+    """
+    accounts = cached_aws_accounts(config)
+    valid_regions = regions or get_valid_regions(config)
+    
+    targets = [(account_id, account_name, region)
+               for account_name, account_id in accounts.items()
+               for region in valid_regions
+               if not _is_dead_region(account_id, region)]
+    skipped = len(accounts) * len(valid_regions) - len(targets)
+    
+    logger.info(f"Searching across {len(accounts)} accounts in {len(valid_regions)} configured regions: {', '.join(valid_regions)}"
+                + (f" ({skipped} account/region pairs skipped as unavailable)" if skipped else ""))
+    if not targets:
+        return
+    
+    executor = ThreadPoolExecutor(max_workers=min(max_workers or MAX_SEARCH_WORKERS, len(targets)),
+                                  thread_name_prefix='aat-find')
+    try:
+        futures = [executor.submit(_search_one, server_name, *target, first_only=first_only, batcher=batcher)
+                   for target in targets]
+        for future in (futures if ordered else as_completed(futures)):
+            yield from future.result()
+    finally:
+        # Stop probing the remaining regions once the caller has what it needs
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _search_accounts(server_name: str, config: Dict[str, Any], max_workers: Optional[int] = None,
+                     regions: Optional[List[str]] = None,
+                     batcher: Optional[InstanceNameBatcher] = None) -> Optional[Tuple[str, str, Dict[str, Any], Any]]:
+    """
+    Search all configured accounts and regions concurrently for an instance.
+    
+    The probes run in parallel, but the match from the earliest account/region
+    in configuration order wins, so a name used in several accounts always
+    resolves to the same instance. The remaining work is then cancelled.
+    
+    Args:
+        server_name: The name tag value to search for
+        config: Configuration dictionary containing AWS accounts
+        max_workers: Maximum concurrent probes (defaults to MAX_SEARCH_WORKERS)
+        regions: Regions to search instead of the configured ones
+        batcher: Optional batcher to coalesce name lookups with concurrent callers
+        
+    Returns:
+        Tuple of (account_name, region, instance_data, ec2_client) if found, None otherwise
+    """
+    search = _iter_search(server_name, config, first_only=True, max_workers=max_workers,
+                          regions=regions, batcher=batcher, ordered=True)
+    try:
+        result = next(search, None)
+    finally:
+        search.close()
+    
+    if result is None:
+        logger.info(f"Instance '{server_name}' not found in any configured account")
+    return result
+
+
+def iter_instances_by_name(server_name: str, config: Dict[str, Any], max_workers: Optional[int] = None,
+                           regions: Optional[List[str]] = None) -> Iterator[Tuple[str, str, Dict[str, Any], Any]]:
+    """
+    Find every EC2 instance with a name tag, yielding each as soon as it is found.
+    
+    Useful for large multi-account setups, where results can be shown while the
+    rest of the search is still running. Stopping iteration early cancels the
+    outstanding searches.
+    
+    Args:
+        server_name: The name tag value to search for, or an instance ID (i-...)
+        config: Configuration dictionary containing AWS accounts
+        max_workers: Maximum concurrent probes (defaults to MAX_SEARCH_WORKERS)
+        regions: Regions to search instead of the configured ones
+        
+    Yields:
+        Tuples of (account_name, region, instance_data, ec2_client)
+    """
+    logger.info(f"Streaming search for instances with name tag: {server_name}")
+    
+    yield from _iter_search(server_name, config, first_only=False, max_workers=max_workers, regions=regions)
+
+
+def find_instance_by_name(server_name: str, config: Dict[str, Any], max_workers: Optional[int] = None,
+                          regions: Optional[List[str]] = None,
+                          batcher: Optional[InstanceNameBatcher] = None) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+    """
+    Find an EC2 instance by name tag across all configured accounts.
+    
+    Accounts and regions are searched concurrently; the first match in
+    configuration order is returned.
+    
+    Args:
+        server_name: The name tag value to search for, or an instance ID (i-...)
         config: Configuration dictionary containing AWS accounts
+        max_workers: Maximum concurrent probes (defaults to MAX_SEARCH_WORKERS)
+        regions: Regions to search instead of the configured ones
+        batcher: Optional batcher to coalesce name lookups with concurrent callers
         
     Returns:
         Tuple of (account_name, region, instance_data) if found, None otherwise
@@ -31,81 +363,30 @@ def find_instance_by_name(server_name: str, config: Dict[str, Any]) -> Optional[
     """
     logger.info(f"Searching for instance with name tag: {server_name}")
     
-    accounts = get_aws_accounts(config)
-    valid_regions = get_valid_regions(config)
-    session_manager = AssumeRoleSessionManager()
-    
-    logger.info(f"Searching across {len(accounts)} accounts in {len(valid_regions)} configured regions: {', '.join(valid_regions)}")
-    
-    # Search through all accounts
-    for account_name, account_id in accounts.items():
-        logger.debug(f"Searching in account: {account_name} ({account_id})")
-        
-        try:
-            # Search in each configured region
-            for region in valid_regions:
-                logger.debug(f"Searching in account {account_name}, region: {region}")
-                
-                try:
-                    # Create EC2 client for this specific region
-                    regional_session = session_manager.assume_role(account_id, region)
-                    ec2 = regional_session.client('ec2')
-                    
-                    # Search for instances with the specified name tag
-                    response = ec2.describe_instances(
-                        Filters=[
-                            {
-                                'Name': 'tag:Name',
-                                'Values': [server_name]
-                            },
-                            {
-                                'Name': 'instance-state-name',
-                                'Values': ['pending', 'running', 'shutting-down', 'stopping', 'stopped']
-                            }
-                        ]
-                    )
-                    
-                    # Check if any instances were found
-                    for reservation in response['Reservations']:
-                        for instance in reservation['Instances']:
-                            # Double-check the actual region from the availability zone
-                            actual_az = instance.get('Placement', {}).get('AvailabilityZone', '')
-                            if actual_az:
-                                # Extract region from AZ (e.g., 'eu-central-1a' -> 'eu-central-1')
-                                actual_region = actual_az[:-1] if actual_az[-1].isalpha() else region
-                                logger.info(f"Found instance {instance['InstanceId']} in account {account_name}, region {actual_region} (AZ: {actual_az})")
-                                return account_name, actual_region, instance
-                            else:
-                                logger.info(f"Found instance {instance['InstanceId']} in account {account_name}, region {region}")
-                                return account_name, region, instance
-                            
-                except ClientError as e:
-                    # Log but continue - some regions might not be accessible
-                    error_code = e.response.get('Error', {}).get('Code', 'Unknown')
-                    if error_code not in ['UnauthorizedOperation', 'OptInRequired']:
-                        logger.warning(f"Error searching in region {region}: {error_code}")
-                    continue
-                    
-        except AssumeRoleError as e:
-            logger.error(f"Failed to assume role in account {account_name}: {e}")
-            continue
-        except Exception as e:
-            logger.error(f"Unexpected error in account {account_name}: {e}")
-            continue
-    
-    logger.info(f"Instance '{server_name}' not found in any configured account")
-    return None
-
-
-def find_instance_with_session(server_name: str, config: Dict[str, Any]) -> Optional[Tuple[str, str, Dict[str, Any], Any]]:
+    result = _search_accounts(server_name, config, max_workers=max_workers, regions=regions, batcher=batcher)
+    if result is None:
+        return None
+    
+    account_name, region, instance, _ = result
+    return account_name, region, instance
+
+
+def find_instance_with_session(server_name: str, config: Dict[str, Any], max_workers: Optional[int] = None,
+                               regions: Optional[List[str]] = None,
+                               batcher: Optional[InstanceNameBatcher] = None) -> Optional[Tuple[str, str, Dict[str, Any], Any]]:
     """
     Find an EC2 instance by name tag and return both instance data and the boto3 session.
     
     This is useful when you need to perform operations on the instance after finding it.
+    Accounts and regions are searched concurrently; the first match in
+    configuration order is returned.
     
     Args:
-        server_name: The name tag value to search for
+        server_name: The name tag value to search for, or an instance ID (i-...)
         config: Configuration dictionary containing AWS accounts
+        max_workers: Maximum concurrent probes (defaults to MAX_SEARCH_WORKERS)
+        regions: Regions to search instead of the configured ones
+        batcher: Optional batcher to coalesce name lookups with concurrent callers
         
     Returns:
         Tuple of (account_name, region, instance_data, ec2_client) if found, None otherwise
@@ -115,67 +396,81 @@ def find_instance_with_session(server_name: str, config: Dict[str, Any]) -> Opti
     """
     logger.info(f"Searching for instance with session: {server_name}")
     
-    accounts = get_aws_accounts(config)
-    valid_regions = get_valid_regions(config)
-    session_manager = AssumeRoleSessionManager()
-    
-    logger.info(f"Searching across {len(accounts)} accounts in {len(valid_regions)} configured regions: {', '.join(valid_regions)}")
-    
-    # Search through all accounts
-    for account_name, account_id in accounts.items():
-        logger.debug(f"Searching in account: {account_name} ({account_id})")
-        
-        try:
-            # Search in each configured region
-            for region in valid_regions:
-                logger.debug(f"Searching in account {account_name}, region: {region}")
-                
-                try:
-                    # Create EC2 client for this specific region
-                    regional_session = session_manager.assume_role(account_id, region)
-                    ec2 = regional_session.client('ec2')
-                    
-                    # Search for instances with the specified name tag
-                    response = ec2.describe_instances(
-                        Filters=[
-                            {
-                                'Name': 'tag:Name',
-                                'Values': [server_name]
-                            },
-                            {
-                                'Name': 'instance-state-name',
-                                'Values': ['pending', 'running', 'shutting-down', 'stopping', 'stopped']
-                            }
-                        ]
-                    )
-                    
-                    # Check if any instances were found
-                    for reservation in response['Reservations']:
-                        for instance in reservation['Instances']:
-                            # Double-check the actual region from the availability zone
-                            actual_az = instance.get('Placement', {}).get('AvailabilityZone', '')
-                            if actual_az:
-                                # Extract region from AZ (e.g., 'eu-central-1a' -> 'eu-central-1')
-                                actual_region = actual_az[:-1] if actual_az[-1].isalpha() else region
-                                logger.info(f"Found instance {instance['InstanceId']} in account {account_name}, region {actual_region} (AZ: {actual_az})")
-                                return account_name, actual_region, instance, ec2
-                            else:
-                                logger.info(f"Found instance {instance['InstanceId']} in account {account_name}, region {region}")
-                                return account_name, region, instance, ec2
-                            
-                except ClientError as e:
-                    # Log but continue - some regions might not be accessible
-                    error_code = e.response.get('Error', {}).get('Code', 'Unknown')
-                    if error_code not in ['UnauthorizedOperation', 'OptInRequired']:
-                        logger.warning(f"Error searching in region {region}: {error_code}")
-                    continue
-                    
-        except AssumeRoleError as e:
-            logger.error(f"Failed to assume role in account {account_name}: {e}")
-            continue
-        except Exception as e:
-            logger.error(f"Unexpected error in account {account_name}: {e}")
-            continue
-    
-    logger.info(f"Instance '{server_name}' not found in any configured account")
-    return None
+    return _search_accounts(server_name, config, max_workers=max_workers, regions=regions, batcher=batcher)
+
+
+def find_instance_by_id(instance_id: str, account: str, region: str,
+                        config: Dict[str, Any]) -> Optional[Tuple[str, str, Dict[str, Any], Any]]:
+    """
+    Look up an instance whose ID, account and region are already known.
+    
+    Skips the multi-account search and reads the state with a single
+    DescribeInstanceStatus call. The returned instance data only carries
+    InstanceId and State.
+    
+    Args:
+        instance_id: EC2 instance ID
+        account: Configured account name or account ID
+        region: AWS region name
+        config: Configuration dictionary containing AWS accounts
+        
+    Returns:
+        Tuple of (account_name, region, instance_data, ec2_client) if found, None otherwise
+        
+    Raises:
+        AssumeRoleError: If unable to assume role in the account
+        ClientError: If the status call fails for a reason other than an unknown ID
+    """
+    accounts = cached_aws_accounts(config)
+    if account in accounts:
+        account_name, account_id = account, accounts[account]
+    else:
+        account_id = account
+        account_name = next((name for name, acc_id in accounts.items() if acc_id == account), account)
+    
+    logger.info(f"Looking up instance {instance_id} in account {account_name}, region {region}")
+    
+    ec2 = get_ec2_client(account_id, region)
+    try:
+        response = ec2.describe_instance_status(InstanceIds=[instance_id], IncludeAllInstances=True)
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') in ('InvalidInstanceID.NotFound', 'InvalidInstanceID.Malformed'):
+            return None
+        raise
+    
+    statuses = response.get('InstanceStatuses', [])
+    if not statuses:
+        return None
+    
+    instance = {'InstanceId': instance_id, 'State': statuses[0].get('InstanceState', {})}
+    return account_name, region, instance, ec2
+
+
+def report_instance_not_found(server_name: str, config: Dict[str, Any],
+                              regions: Optional[List[str]] = None) -> None:
+    """
+    Print the standard "instance not found" message and the accounts that were checked.
+    
+    Args:
+        server_name: The name tag value that was searched for
+        config: Configuration dictionary containing AWS accounts
+        regions: Regions searched instead of the configured ones
+    """
+    lines = [f"\n❌ No EC2 instance found with name tag: {server_name}"]
+    
+    skipped = count_dead_regions(config, regions)
+    if skipped:
+        lines.append(f"   Checked all configured accounts and regions except {skipped} account/region "
+                     f"pairs skipped as unavailable (region not enabled or not authorized).")
+    else:
+        lines.append("   Checked all configured accounts and regions.")
+    
+    # Show which accounts were checked
+    accounts = cached_aws_accounts(config)
+    if accounts:
+        lines.append(f"\n📋 Accounts checked:")
+        lines.extend(f"   • {account_name} ({account_id})" for account_name, account_id in accounts.items())
+    else:
+        lines.append("\n⚠️  No AWS accounts configured. Run 'aat configure' to set up accounts.")
+    
+    sys.stdout.write('\n'.join(lines) + '\n')
@@ -6,14 +6,77 @@ about EC2 instances by their name tag across multiple AWS accounts.
 """
 
 import logging
-from typing import Dict, Any
-from tabulate import tabulate
+import sys
+import textwrap
+from typing import Dict, Any, List, Sequence
 
-from ec2.find import find_instance_by_name
-from load_config import get_aws_accounts
+from ec2.find import find_instance_by_name, report_instance_not_found
 
 logger = logging.getLogger('aws-automation-tamer.ec2.info')
 
+# Tags shown as their own rows, in display order; everything else is grouped
+_IMPORTANT_TAGS = ('Name', 'Environment', 'Project', 'Owner', 'CostCenter')
+_IMPORTANT_TAG_SET = frozenset(_IMPORTANT_TAGS)
+
+
+def _get_nested(data: Dict[str, Any], *keys: str, default: Any = 'N/A') -> Any:
+    """
+    Walk nested dictionaries without allocating empty dicts for missing levels.
+    
+    Args:
+        data: Dictionary to read from
+        *keys: Keys to follow, outermost first
+        default: Value returned if any level is missing or not a dictionary
+        
+    Returns:
+        The nested value, or default
+    """
+    for key in keys:
+        if not isinstance(data, dict):
+            return default
+        data = data.get(key)
+        if data is None:
+            return default
+    return data
+
+
+def _render_grid(rows: Sequence[Sequence[Any]], headers: Sequence[str], max_widths: Sequence[int]) -> str:
+    """
+    Render rows as a grid table with wrapped cells.
+    
+    Args:
+        rows: Table rows, one value per column
+        headers: Column headers
+        max_widths: Maximum text width per column; longer values are wrapped
+        
+    Returns:
+        Formatted table string
+    """
+    def wrap(row: Sequence[Any]) -> List[List[str]]:
+        return [textwrap.wrap(str(cell), width) or [''] for cell, width in zip(row, max_widths)]
+    
+    header_cells = wrap(headers)
+    body_cells = [wrap(row) for row in rows]
+    
+    widths = [max(len(line) for row in [header_cells, *body_cells] for line in row[col])
+              for col in range(len(headers))]
+    
+    row_border = '+' + '+'.join('-' * (width + 2) for width in widths) + '+'
+    header_border = '+' + '+'.join('=' * (width + 2) for width in widths) + '+'
+    
+    def render_row(cells: List[List[str]]) -> List[str]:
+        height = max(len(lines) for lines in cells)
+        return ['| ' + ' | '.join((lines[i] if i < len(lines) else '').ljust(width)
+                                  for lines, width in zip(cells, widths)) + ' |'
+                for i in range(height)]
+    
+    output = [row_border, *render_row(header_cells), header_border]
+    for cells in body_cells:
+        output.extend(render_row(cells))
+        output.append(row_border)
+    
+    return '\n'.join(output)
+
 
 def format_instance_info(instance_data: Dict[str, Any], account_name: str, region: str) -> str:
     """
@@ -30,7 +93,7 @@ def format_instance_info(instance_data: Dict[str, Any], account_name: str, regio
     # Extract basic instance information
     instance_id = instance_data.get('InstanceId', 'N/A')
     instance_type = instance_data.get('InstanceType', 'N/A')
-    state = instance_data.get('State', {}).get('Name', 'N/A')
+    state = _get_nested(instance_data, 'State', 'Name')
     launch_time = instance_data.get('LaunchTime', 'N/A')
     if launch_time != 'N/A':
         launch_time = launch_time.strftime('%Y-%m-%d %H:%M:%S UTC')
@@ -38,20 +101,17 @@ def format_instance_info(instance_data: Dict[str, Any], account_name: str, regio
     # Network information
     vpc_id = instance_data.get('VpcId', 'N/A')
     subnet_id = instance_data.get('SubnetId', 'N/A')
-    availability_zone = instance_data.get('Placement', {}).get('AvailabilityZone', 'N/A')
+    availability_zone = _get_nested(instance_data, 'Placement', 'AvailabilityZone')
     private_ip = instance_data.get('PrivateIpAddress', 'N/A')
     public_ip = instance_data.get('PublicIpAddress', 'N/A')
     
     # Security groups
-    security_groups = []
-    for sg in instance_data.get('SecurityGroups', []):
-        security_groups.append(f"{sg['GroupName']} ({sg['GroupId']})")
-    security_groups_str = ', '.join(security_groups) if security_groups else 'N/A'
+    security_groups_str = ', '.join(
+        f"{sg['GroupName']} ({sg['GroupId']})" for sg in instance_data.get('SecurityGroups', ())
+    ) or 'N/A'
     
     # Tags
-    tags = {}
-    for tag in instance_data.get('Tags', []):
-        tags[tag['Key']] = tag['Value']
+    tags = {tag['Key']: tag['Value'] for tag in instance_data.get('Tags', ())}
     
     # Key pair
     key_name = instance_data.get('KeyName', 'N/A')
@@ -60,18 +120,14 @@ def format_instance_info(instance_data: Dict[str, Any], account_name: str, regio
     root_device_name = instance_data.get('RootDeviceName', 'N/A')
     root_device_type = instance_data.get('RootDeviceType', 'N/A')
     
-    # Block device mappings
-    block_devices = []
-    for bdm in instance_data.get('BlockDeviceMappings', []):
-        device_name = bdm.get('DeviceName', 'N/A')
-        if 'Ebs' in bdm:
-            volume_id = bdm['Ebs'].get('VolumeId', 'N/A')
-            volume_size = 'N/A'  # We'd need to query the volume for size
-            block_devices.append(f"{device_name}: {volume_id}")
-    block_devices_str = ', '.join(block_devices) if block_devices else 'N/A'
+    # Block device mappings (volume size would need a separate volume query)
+    block_devices_str = ', '.join(
+        f"{bdm.get('DeviceName', 'N/A')}: {bdm['Ebs'].get('VolumeId', 'N/A')}"
+        for bdm in instance_data.get('BlockDeviceMappings', ()) if 'Ebs' in bdm
+    ) or 'N/A'
     
     # Monitoring
-    monitoring = instance_data.get('Monitoring', {}).get('State', 'N/A')
+    monitoring = _get_nested(instance_data, 'Monitoring', 'State')
     
     # Platform details
     platform = instance_data.get('Platform', 'Linux/Unix')
@@ -99,24 +155,27 @@ def format_instance_info(instance_data: Dict[str, Any], account_name: str, regio
         ['Monitoring', monitoring],
     ]
     
-    # Add important tags
-    important_tags = ['Name', 'Environment', 'Project', 'Owner', 'CostCenter']
-    for tag_key in important_tags:
-        if tag_key in tags:
-            table_data.append([f'Tag: {tag_key}', tags[tag_key]])
-    
-    # Add other tags if there are any not covered above
+    # Split tags into important ones and the rest in a single pass
+    important_tags = {}
     other_tags = []
     for key, value in tags.items():
-        if key not in important_tags:
+        if key in _IMPORTANT_TAG_SET:
+            important_tags[key] = value
+        else:
             other_tags.append(f"{key}={value}")
     
+    # Add important tags
+    for tag_key in _IMPORTANT_TAGS:
+        if tag_key in important_tags:
+            table_data.append([f'Tag: {tag_key}', important_tags[tag_key]])
+    
+    # Add other tags if there are any not covered above
     if other_tags:
         table_data.append(['Other Tags', ', '.join(other_tags)])
     
     # Create the table
     headers = ['Property', 'Value']
-    table = tabulate(table_data, headers=headers, tablefmt='grid', maxcolwidths=[25, 50])
+    table = _render_grid(table_data, headers, max_widths=[25, 50])
     
     return table
 
@@ -131,36 +190,27 @@ def get_instance_info(server_name: str, config: Dict[str, Any]) -> None:
     """
     logger.info(f"Getting instance info for: {server_name}")
     
-    print(f"🔍 Searching for EC2 instance: {server_name}")
-    print("   Checking all configured accounts and regions...")
+    sys.stdout.write(f"🔍 Searching for EC2 instance: {server_name}\n"
+                     "   Checking all configured accounts and regions...\n")
+    sys.stdout.flush()
     
     try:
         result = find_instance_by_name(server_name, config)
         
         if result is None:
-            print(f"\n❌ No EC2 instance found with name tag: {server_name}")
-            print("   Checked all configured accounts and regions.")
-            
-            # Show which accounts were checked
-            accounts = get_aws_accounts(config)
-            if accounts:
-                print(f"\n📋 Accounts checked:")
-                for account_name, account_id in accounts.items():
-                    print(f"   • {account_name} ({account_id})")
-            else:
-                print("\n⚠️  No AWS accounts configured. Run 'aat configure' to set up accounts.")
-            
+            report_instance_not_found(server_name, config)
             return
         
         account_name, region, instance_data = result
         
-        print(f"\n✅ Found EC2 instance: {server_name}")
-        print(f"   Located in account: {account_name}, region: {region}")
-        print()
-        
-        # Display detailed information in table format
+        # Display detailed information in table format, written in one go
         table = format_instance_info(instance_data, account_name, region)
-        print(table)
+        sys.stdout.write('\n'.join([
+            f"\n✅ Found EC2 instance: {server_name}",
+            f"   Located in account: {account_name}, region: {region}",
+            "",
+            table,
+        ]) + '\n')
         
         logger.info(f"Successfully displayed info for instance {instance_data.get('InstanceId')} in {account_name}")
         
@@ -0,0 +1,91 @@
+"""
+EC2 instance state waiting module.
+
+This module provides functionality to wait for EC2 instances to reach a
+target state, polling quickly at first and backing off to longer delays.
+"""
+
+import logging
+import time
+from typing import Any, Optional, Sequence
+
+from botocore.exceptions import ClientError
+
+logger = logging.getLogger('aws-automation-tamer.ec2.waiters')
+
+# State changes often finish within seconds, so poll quickly at first and then
+# settle at the 15 second delay the boto3 waiters use
+POLL_DELAYS = (1, 2, 4, 8, 15)
+
+
+class InstanceWaitError(Exception):
+    """Raised when an instance does not reach the expected state."""
+
+
+def _get_instance_state(ec2_client: Any, instance_id: str) -> Optional[str]:
+    """
+    Get the current state name of an instance.
+    
+    Uses DescribeInstanceStatus, whose response is a fraction of the size of a
+    full DescribeInstances response.
+    
+    Args:
+        ec2_client: boto3 EC2 client
+        instance_id: EC2 instance ID
+        
+    Returns:
+        The state name, or None if the instance is not visible yet
+    """
+    try:
+        response = ec2_client.describe_instance_status(InstanceIds=[instance_id],
+                                                       IncludeAllInstances=True)
+    except ClientError as e:
+        # Newly changed instances can briefly be missing (eventual consistency)
+        if e.response.get('Error', {}).get('Code') == 'InvalidInstanceID.NotFound':
+            return None
+        raise
+    
+    for status in response.get('InstanceStatuses', []):
+        return status.get('InstanceState', {}).get('Name')
+    return None
+
+
+def wait_for_instance_state(ec2_client: Any, instance_id: str, target_state: str,
+                            timeout: int = 600, failure_states: Sequence[str] = ()) -> None:
+    """
+    Wait for an EC2 instance to reach a target state.
+    
+    Polls with increasing delays (see POLL_DELAYS), so fast transitions are
+    noticed within a second or two instead of a full fixed waiter delay.
+    
+    Args:
+        ec2_client: boto3 EC2 client
+        instance_id: EC2 instance ID
+        target_state: State to wait for (e.g. 'running', 'stopped')
+        timeout: Maximum time to wait in seconds
+        failure_states: States that mean the target will not be reached
+        
+    Raises:
+        InstanceWaitError: If the instance enters a failure state or the timeout expires
+        ClientError: If the state cannot be queried
+    """
+    deadline = time.monotonic() + timeout
+    attempt = 0
+    
+    while True:
+        state = _get_instance_state(ec2_client, instance_id)
+        if state == target_state:
+            return
+        if state in failure_states:
+            raise InstanceWaitError(f"Instance {instance_id} entered '{state}' state "
+                                    f"while waiting for '{target_state}'")
+        
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise InstanceWaitError(f"Timed out after {timeout}s waiting for instance {instance_id} "
+                                    f"to reach '{target_state}' (last state: '{state}')")
+        
+        delay = POLL_DELAYS[min(attempt, len(POLL_DELAYS) - 1)]
+        logger.debug("Instance %s is '%s', checking again in %ss", instance_id, state, delay)
+        time.sleep(min(delay, remaining))
+        attempt += 1
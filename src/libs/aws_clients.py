@@ -0,0 +1,144 @@
+"""
+AWS client cache.
+
+This module hands out assumed-role sessions and boto3 clients and keeps them
+for reuse, so repeated operations against the same account and region skip
+the STS AssumeRole call, session setup and client construction.
+
+Features:
+- One shared session and EC2 client per (account, region), reused across threads
+- Expiry well ahead of the assumed-role credential lifetime
+- Adaptive retries, TCP keepalive and a connection pool sized for parallel searches
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Tuple
+from botocore.config import Config
+
+from libs.aws_session_manager import AssumeRoleSessionManager
+
+# Set up logging
+logger = logging.getLogger('aws-automation-tamer.aws-clients')
+
+# Assumed-role credentials last an hour; cached sessions are rebuilt well before
+# that, and clients never outlive the session they were built from
+CLIENT_CACHE_TTL = 2400
+
+# Shared by every EC2 client: adaptive retries back off under throttling, and the
+# pool is large enough for the concurrent account/region probes of a search
+EC2_CLIENT_CONFIG = Config(
+    retries={'mode': 'adaptive', 'max_attempts': 10},
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    connect_timeout=3,
+    read_timeout=10
+)
+
+_session_manager = AssumeRoleSessionManager()
+_session_cache: Dict[Tuple[str, str], Tuple[Any, float]] = {}
+_client_cache: Dict[Tuple[str, str], Tuple[Any, float]] = {}
+_client_cache_lock = threading.Lock()
+
+# One lock per (account, region), held while that key's client is built: the
+# session is shared, and building clients from one session concurrently is not
+# thread-safe
+_client_build_locks: Dict[Tuple[str, str], threading.Lock] = {}
+
+
+def _get_session_entry(account_id: str, region: str) -> Tuple[Any, float]:
+    """
+    Get a cached (session, expires_at) pair, assuming the role when needed.
+    
+    Args:
+        account_id: AWS account ID
+        region: AWS region name
+        
+    Returns:
+        Tuple of (boto3 session, monotonic expiry time)
+        
+    Raises:
+        AssumeRoleError: If role assumption fails
+    """
+    key = (account_id, region)
+    now = time.monotonic()
+    
+    with _client_cache_lock:
+        cached = _session_cache.get(key)
+    if cached is not None and cached[1] > now:
+        return cached
+    
+    entry = (_session_manager.assume_role(account_id, region), now + CLIENT_CACHE_TTL)
+    with _client_cache_lock:
+        _session_cache[key] = entry
+    logger.debug(f"Cached session for account {account_id}, region {region}")
+    return entry
+
+
+def get_session(account_id: str, region: str) -> Any:
+    """
+    Get an assumed-role session for an account/region, reusing a cached one when still fresh.
+    
+    Args:
+        account_id: AWS account ID
+        region: AWS region name
+        
+    Returns:
+        boto3 session using the assumed role credentials
+        
+    Raises:
+        AssumeRoleError: If role assumption fails
+    """
+    return _get_session_entry(account_id, region)[0]
+
+
+def get_ec2_client(account_id: str, region: str) -> Any:
+    """
+    Get an EC2 client for an account/region, reusing a cached one when still fresh.
+    
+    botocore clients are thread-safe, so cached clients are shared between threads.
+    Only one client is built per account/region; concurrent callers that miss
+    the cache wait for it.
+    
+    Args:
+        account_id: AWS account ID
+        region: AWS region name
+        
+    Returns:
+        boto3 EC2 client using the assumed role credentials
+        
+    Raises:
+        AssumeRoleError: If role assumption fails
+    """
+    key = (account_id, region)
+    now = time.monotonic()
+    
+    with _client_cache_lock:
+        cached = _client_cache.get(key)
+        build_lock = _client_build_locks.setdefault(key, threading.Lock())
+    if cached is not None and cached[1] > now:
+        return cached[0]
+    
+    with build_lock:
+        # Another thread may have built the client while this one waited
+        with _client_cache_lock:
+            cached = _client_cache.get(key)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+        
+        session, expires_at = _get_session_entry(account_id, region)
+        ec2 = session.client('ec2', config=EC2_CLIENT_CONFIG)
+        
+        with _client_cache_lock:
+            _client_cache[key] = (ec2, expires_at)
+    logger.debug(f"Cached EC2 client for account {account_id}, region {region}")
+    return ec2
+
+
+def clear_cache() -> None:
+    """Drop every cached session and client."""
+    with _client_cache_lock:
+        _session_cache.clear()
+        _client_cache.clear()
+    logger.debug("Client cache cleared")
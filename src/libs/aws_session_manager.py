@@ -10,21 +10,98 @@ Features:
 - Dynamic session naming for better audit trails
 - Regional STS endpoints for better performance
 - Input validation and comprehensive error handling
-- Optional session caching for performance
+- Optional session caching with jittered expiry and LRU eviction
+- Shared service model loader across assumed-role sessions
+- Assumed-role credentials that refresh themselves before they expire
+- One source credential provider shared by every STS client
+- Concurrent role assumption across many accounts
 - Backwards compatibility with original function
 """
 
 import boto3
-import uuid
-import re
+import botocore.loaders
+import botocore.session
+import functools
+import os
+import random
+import secrets
+import time
 import logging
-from typing import Optional, Dict, Any
-from datetime import datetime, timezone
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple
+from botocore.config import Config
+from botocore.credentials import RefreshableCredentials
 from botocore.exceptions import ClientError, NoCredentialsError
 
 # Set up logging
 logger = logging.getLogger('aws-automation-tamer.session-manager')
 
+# Service model loader shared by every assumed-role session, so the botocore
+# data files are parsed once per process rather than once per session
+_SHARED_DATA_LOADER = botocore.loaders.create_loader()
+
+# Valid AWS regions (subset of commonly used ones)
+_VALID_REGIONS = frozenset({
+    'us-east-1', 'us-east-2', 'us-west-1', 'us-west-2',
+    'eu-west-1', 'eu-west-2', 'eu-west-3', 'eu-central-1',
+    'ap-southeast-1', 'ap-southeast-2', 'ap-northeast-1', 'ap-northeast-2',
+    'ca-central-1', 'sa-east-1', 'ap-south-1'
+})
+
+# STS calls are few and short-lived, so unlike the EC2 clients there is no TCP
+# keepalive, and fewer retry attempts let an unreachable or denied role fail
+# fast. The user agent marks these calls in CloudTrail as coming from the
+# session manager, and the pool leaves room for assume_roles with more workers
+# than its default of 10
+_STS_CONFIG = Config(
+    retries={'mode': 'adaptive', 'max_attempts': 5},
+    max_pool_connections=50,
+    connect_timeout=3,
+    read_timeout=10,
+    user_agent_extra='aws-automation-tamer/session-manager'
+)
+
+# Session holding the caller's own credentials, which every STS client is built
+# from so the source credentials (e.g. from the instance metadata service) are
+# resolved once and refreshed in one place
+_source_session: Optional[boto3.Session] = None
+_source_session_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=32)
+def _sts_client(region_name: str, endpoint_url: str) -> Any:
+    """
+    Get the STS client for a region, created once from the shared source session.
+    
+    botocore clients are thread-safe, so one client per region is shared by
+    every role assumption. Clients are created under a lock because creating
+    clients from one session concurrently is not thread-safe. When running on
+    EC2, the instance metadata service gets a 1 second timeout and 3 attempts
+    unless configured otherwise through the environment.
+    
+    Args:
+        region_name: AWS region name
+        endpoint_url: STS endpoint URL
+        
+    Returns:
+        boto3 STS client
+    """
+    global _source_session
+    
+    with _source_session_lock:
+        if _source_session is None:
+            botocore_session = botocore.session.Session()
+            if 'AWS_METADATA_SERVICE_TIMEOUT' not in os.environ:
+                botocore_session.set_config_variable('metadata_service_timeout', 1)
+            if 'AWS_METADATA_SERVICE_NUM_ATTEMPTS' not in os.environ:
+                botocore_session.set_config_variable('metadata_service_num_attempts', 3)
+            _source_session = boto3.Session(botocore_session=botocore_session)
+        
+        return _source_session.client('sts', region_name=region_name, endpoint_url=endpoint_url,
+                                      config=_STS_CONFIG)
+
 
 class AssumeRoleError(Exception):
     """
@@ -62,6 +139,16 @@ class AssumeRoleError(Exception):
         super().__init__(full_message)
 
 
+class _InFlight:
+    """A role assumption in progress, shared with the callers waiting for it."""
+    
+    __slots__ = ('event', 'error')
+    
+    def __init__(self):
+        self.event = threading.Event()
+        self.error: Optional[AssumeRoleError] = None
+
+
 class AssumeRoleSessionManager:
     """
     Manages AWS role assumption with best practices.
@@ -70,23 +157,16 @@ class AssumeRoleSessionManager:
     across AWS accounts while following security and operational best practices.
     """
     
-    # AWS account ID pattern (12 digits)
-    ACCOUNT_ID_PATTERN = re.compile(r'^\d{12}$')
-    
-    # Valid AWS regions (subset of commonly used ones)
-    VALID_REGIONS = {
-        'us-east-1', 'us-east-2', 'us-west-1', 'us-west-2',
-        'eu-west-1', 'eu-west-2', 'eu-west-3', 'eu-central-1',
-        'ap-southeast-1', 'ap-southeast-2', 'ap-northeast-1', 'ap-northeast-2',
-        'ca-central-1', 'sa-east-1', 'ap-south-1'
-    }
+    # Kept for backwards compatibility; validation uses the module-level set
+    VALID_REGIONS = _VALID_REGIONS
     
     def __init__(self, 
                  default_role_name: str = "aws-automation-tamer-admin",
                  session_duration: int = 3600,
                  session_name_prefix: str = "AwsAutomationTamer",
                  external_id: Optional[str] = None,
-                 enable_caching: bool = False):
+                 enable_caching: bool = False,
+                 max_cache_size: int = 128):
         """
         Initialize the session manager.
         
@@ -96,21 +176,28 @@ class AssumeRoleSessionManager:
             session_name_prefix: Prefix for generated session names
             external_id: External ID for additional security (optional)
             enable_caching: Whether to cache sessions for performance
+            max_cache_size: Maximum cached sessions; least recently used ones are evicted
         """
         self.default_role_name = default_role_name
         self.session_duration = session_duration
         self.session_name_prefix = session_name_prefix
         self.external_id = external_id
         self.enable_caching = enable_caching
+        self.max_cache_size = max_cache_size
+        
+        # Session cache of (session, expires_at) in least recently used order
+        self._session_cache: 'OrderedDict[str, Tuple[boto3.Session, float]]' = OrderedDict()
+        self._cache_lock = threading.Lock()
         
-        # Session cache
-        self._session_cache: Dict[str, boto3.Session] = {}
+        # Cache keys being assumed right now, so concurrent callers wait for
+        # that result instead of making their own STS call
+        self._inflight: Dict[str, _InFlight] = {}
         
         # Validate configuration
         self._validate_configuration()
         
-        logger.debug(f"AssumeRoleSessionManager initialized with role={default_role_name}, "
-                    f"duration={session_duration}s, caching={enable_caching}")
+        logger.debug("AssumeRoleSessionManager initialized with role=%s, duration=%ss, caching=%s",
+                     default_role_name, session_duration, enable_caching)
     
     def _validate_configuration(self) -> None:
         """Validate the configuration parameters."""
@@ -122,6 +209,9 @@ class AssumeRoleSessionManager:
         
         if not self.session_name_prefix or len(self.session_name_prefix) > 32:
             raise ValueError(f"Invalid session_name_prefix: {self.session_name_prefix}")
+        
+        if self.max_cache_size < 1:
+            raise ValueError(f"max_cache_size must be at least 1, got {self.max_cache_size}")
     
     def _validate_inputs(self, account_id: str, region_name: str, role_name: Optional[str] = None) -> None:
         """
@@ -139,7 +229,7 @@ class AssumeRoleSessionManager:
         if not account_id or not isinstance(account_id, str):
             raise ValueError(f"account_id must be a non-empty string, got: {account_id}")
         
-        if not self.ACCOUNT_ID_PATTERN.match(account_id):
+        if len(account_id) != 12 or not (account_id.isascii() and account_id.isdigit()):
             raise ValueError(f"account_id must be a 12-digit string, got: {account_id}")
         
         # Validate region
@@ -147,8 +237,8 @@ class AssumeRoleSessionManager:
             raise ValueError(f"region_name must be a non-empty string, got: {region_name}")
         
         # For regions, we'll be flexible but log if it's not in our known list
-        if region_name not in self.VALID_REGIONS:
-            logger.warning(f"Using potentially invalid region: {region_name}")
+        if region_name not in _VALID_REGIONS:
+            logger.warning("Using potentially invalid region: %s", region_name)
         
         # Validate role name if provided
         if role_name is not None:
@@ -160,10 +250,10 @@ class AssumeRoleSessionManager:
         Generate a unique session name for better audit trails.
         
         Returns:
-            A unique session name with timestamp and UUID
+            A unique session name with UTC timestamp and random suffix
         """
-        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
-        unique_id = str(uuid.uuid4())[:8]  # Short UUID
+        timestamp = time.strftime("%Y%m%d%H%M%S", time.gmtime())
+        unique_id = secrets.token_hex(4)  # 8 hex characters
         return f"{self.session_name_prefix}-{timestamp}-{unique_id}"
     
     def _get_sts_endpoint_url(self, region_name: str) -> str:
@@ -237,28 +327,78 @@ class AssumeRoleSessionManager:
                                 region=region_name)
         
         # Check cache if enabled
+        cache_key: Optional[str] = None
+        leader: Optional[_InFlight] = None
         if self.enable_caching:
             cache_key = self._get_cache_key(account_id, region_name, effective_role_name)
-            if cache_key in self._session_cache:
-                logger.debug(f"Returning cached session for {cache_key}")
-                return self._session_cache[cache_key]
+            while True:
+                with self._cache_lock:
+                    cached = self._session_cache.get(cache_key)
+                    if cached is not None:
+                        if cached[1] > time.monotonic():
+                            self._session_cache.move_to_end(cache_key)
+                            logger.debug("Returning cached session for %s", cache_key)
+                            return cached[0]
+                        del self._session_cache[cache_key]
+                    
+                    inflight = self._inflight.get(cache_key)
+                    if inflight is None:
+                        # This thread assumes the role; others wait for it below
+                        leader = self._inflight[cache_key] = _InFlight()
+                        break
+                
+                # Another thread is assuming this role; use its result once it
+                # is cached, or fail with its error rather than retrying one by one
+                inflight.event.wait()
+                if inflight.error is not None:
+                    raise inflight.error
         
-        logger.info(f"Assuming role {effective_role_name} in account {account_id} for region {region_name}")
+        try:
+            return self._assume_role_with_sts(account_id, region_name, effective_role_name, cache_key)
+        except AssumeRoleError as e:
+            # Waiting callers get this failure instead of each retrying in turn
+            if leader is not None:
+                leader.error = e
+            raise
+        finally:
+            # Wake up any callers waiting for this role
+            if leader is not None:
+                with self._cache_lock:
+                    del self._inflight[cache_key]
+                leader.event.set()
+    
+    def _assume_role_with_sts(self,
+                              account_id: str,
+                              region_name: str,
+                              effective_role_name: str,
+                              cache_key: Optional[str]) -> boto3.Session:
+        """
+        Call STS to assume a role and cache the resulting session.
+        
+        Args:
+            account_id: Target AWS account ID
+            region_name: AWS region name
+            effective_role_name: IAM role name to assume
+            cache_key: Session cache key, or None when caching is disabled
+            
+        Returns:
+            boto3.Session configured with assumed role credentials
+            
+        Raises:
+            AssumeRoleError: If role assumption fails
+        """
+        logger.info("Assuming role %s in account %s for region %s", effective_role_name, account_id, region_name)
         
         try:
             # Create STS client with regional endpoint
             sts_endpoint = self._get_sts_endpoint_url(region_name)
-            sts_client = boto3.client('sts', 
-                                    region_name=region_name,
-                                    endpoint_url=sts_endpoint)
+            sts_client = _sts_client(region_name, sts_endpoint)
             
             # Build assume role parameters
             role_arn = self._build_role_arn(account_id, effective_role_name)
-            session_name = self._generate_session_name()
             
             assume_role_params = {
                 'RoleArn': role_arn,
-                'RoleSessionName': session_name,
                 'DurationSeconds': self.session_duration
             }
             
@@ -266,34 +406,63 @@ class AssumeRoleSessionManager:
             if self.external_id:
                 assume_role_params['ExternalId'] = self.external_id
             
-            logger.debug(f"Calling assume_role with params: {assume_role_params}")
+            def fetch_credentials() -> Dict[str, str]:
+                # Called now and again by botocore shortly before the credentials expire
+                params = dict(assume_role_params, RoleSessionName=self._generate_session_name())
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Calling assume_role with params: %s", params)
+                
+                credentials = sts_client.assume_role(**params)['Credentials']
+                try:
+                    access_key, secret_key, token, expiration = (
+                        credentials['AccessKeyId'], credentials['SecretAccessKey'],
+                        credentials['SessionToken'], credentials['Expiration']
+                    )
+                except KeyError as e:
+                    raise ValueError(f"AssumeRole response is missing credential field {e}")
+                
+                return {
+                    'access_key': access_key,
+                    'secret_key': secret_key,
+                    'token': token,
+                    'expiry_time': expiration.isoformat()
+                }
             
-            # Assume the role
-            response = sts_client.assume_role(**assume_role_params)
-            credentials = response['Credentials']
-            
-            # Create session with assumed role credentials
-            session = boto3.Session(
-                aws_access_key_id=credentials['AccessKeyId'],
-                aws_secret_access_key=credentials['SecretAccessKey'],
-                aws_session_token=credentials['SessionToken']
+            # Create session with assumed role credentials that refresh themselves
+            botocore_session = botocore.session.Session()
+            botocore_session._credentials = RefreshableCredentials.create_from_metadata(
+                metadata=fetch_credentials(),
+                refresh_using=fetch_credentials,
+                method='sts-assume-role'
             )
+            session = boto3.Session(region_name=region_name, botocore_session=botocore_session)
+            
+            # Clients built from this session load service models through the
+            # shared loader (registered after boto3 has set up its own resource
+            # loader, which keeps the shared search paths from growing)
+            botocore_session.register_component('data_loader', _SHARED_DATA_LOADER)
             
             # Cache session if enabled
-            if self.enable_caching:
-                cache_key = self._get_cache_key(account_id, region_name, effective_role_name)
-                self._session_cache[cache_key] = session
-                logger.debug(f"Cached session for {cache_key}")
+            if cache_key is not None:
+                # Expire a little early, by a random amount, so sessions cached
+                # together are not all re-assumed at the same moment
+                expires_at = time.monotonic() + self.session_duration - random.uniform(60, 300)
+                with self._cache_lock:
+                    self._session_cache[cache_key] = (session, expires_at)
+                    self._session_cache.move_to_end(cache_key)
+                    while len(self._session_cache) > self.max_cache_size:
+                        self._session_cache.popitem(last=False)
+                logger.debug("Cached session for %s", cache_key)
             
-            logger.info(f"Successfully assumed role {effective_role_name} in account {account_id}")
+            logger.info("Successfully assumed role %s in account %s", effective_role_name, account_id)
             return session
             
         except ClientError as e:
             error_code = e.response.get('Error', {}).get('Code', 'Unknown')
             error_message = e.response.get('Error', {}).get('Message', str(e))
             
-            logger.error(f"Failed to assume role {effective_role_name} in account {account_id}: "
-                        f"{error_code} - {error_message}")
+            logger.error("Failed to assume role %s in account %s: %s - %s",
+                         effective_role_name, account_id, error_code, error_message)
             
             raise AssumeRoleError(
                 f"AWS API error during role assumption: {error_code} - {error_message}",
@@ -314,7 +483,7 @@ class AssumeRoleSessionManager:
             )
             
         except Exception as e:
-            logger.error(f"Unexpected error during role assumption: {e}")
+            logger.error("Unexpected error during role assumption: %s", e)
             raise AssumeRoleError(
                 f"Unexpected error during role assumption: {e}",
                 account_id=account_id,
@@ -323,9 +492,44 @@ class AssumeRoleSessionManager:
                 original_error=e
             )
     
+    def assume_roles(self,
+                     targets: List[Tuple[str, str, Optional[str]]],
+                     max_workers: int = 10) -> Dict[Tuple[str, str, Optional[str]], boto3.Session]:
+        """
+        Assume roles in several accounts/regions concurrently.
+        
+        STS calls are I/O-bound, so they run on a thread pool; workers share the
+        per-region STS clients and, if enabled, the session cache.
+        
+        Args:
+            targets: (account_id, region_name, role_name) tuples; role_name may be
+                None to use the default role
+            max_workers: Maximum concurrent role assumptions
+            
+        Returns:
+            Dictionary mapping each target tuple to its boto3.Session
+            
+        Raises:
+            AssumeRoleError: If any role assumption fails; pending ones are cancelled
+        """
+        if not targets:
+            return {}
+        
+        logger.info("Assuming roles for %d targets with up to %d workers", len(targets), max_workers)
+        
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(targets)),
+                                      thread_name_prefix='aat-assume-role')
+        try:
+            futures = {target: executor.submit(self.assume_role, *target) for target in targets}
+            return {target: future.result() for target, future in futures.items()}
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
     def clear_cache(self) -> None:
-        """Clear the session cache."""
-        self._session_cache.clear()
+        """Clear the session cache and the cached STS clients."""
+        with self._cache_lock:
+            self._session_cache.clear()
+        _sts_client.cache_clear()
         logger.debug("Session cache cleared")
     
     def get_cache_info(self) -> Dict[str, Any]:
@@ -333,12 +537,18 @@ class AssumeRoleSessionManager:
         Get information about the current cache state.
         
         Returns:
-            Dictionary with cache statistics
+            Dictionary with cache statistics, including the seconds until each
+            cached session expires
         """
+        now = time.monotonic()
+        with self._cache_lock:
+            entries = list(self._session_cache.items())
         return {
             'enabled': self.enable_caching,
-            'size': len(self._session_cache),
-            'keys': list(self._session_cache.keys()) if self.enable_caching else []
+            'size': len(entries),
+            'max_size': self.max_cache_size,
+            'keys': [key for key, _ in entries] if self.enable_caching else [],
+            'expires_in': {key: max(0, int(expires_at - now)) for key, (_, expires_at) in entries}
         }
 
 
@@ -0,0 +1,207 @@
+"""
+DescribeInstances request batcher.
+
+This module coalesces concurrent instance-name lookups against the same
+account and region into a single DescribeInstances call, which keeps bursty
+workloads (scripted loops, daemons) well under the EC2 request rate limits.
+
+Features:
+- One DescribeInstances call per (account, region) per batching window
+- Configurable batching delay and batch size
+- Results delivered to each caller through a concurrent.futures.Future
+- Name tag values honour EC2's filter wildcards (* and ?, escaped with a backslash)
+"""
+
+import logging
+import re
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Pattern, Sequence, Tuple
+
+# Set up logging
+logger = logging.getLogger('aws-automation-tamer.describe-batcher')
+
+# Instance states a name lookup should match
+SEARCHABLE_STATES = ('pending', 'running', 'shutting-down', 'stopping', 'stopped')
+
+# Characters with a special meaning in EC2 filter values
+_WILDCARD_CHARS = frozenset('*?\\')
+
+
+def _wildcard_pattern(value: str) -> Optional[Pattern]:
+    """
+    Translate an EC2 filter value with wildcards into a regular expression.
+    
+    EC2 treats * as any run of characters and ? as any single character; a
+    backslash makes the next character literal.
+    
+    Args:
+        value: Filter value as sent to EC2
+        
+    Returns:
+        Compiled pattern matching what EC2 would match, or None if the value
+        has no special characters and must be matched exactly
+    """
+    if not _WILDCARD_CHARS.intersection(value):
+        return None
+    
+    parts = []
+    chars = iter(value)
+    for char in chars:
+        if char == '\\':
+            parts.append(re.escape(next(chars, '\\')))
+        elif char == '*':
+            parts.append('.*')
+        elif char == '?':
+            parts.append('.')
+        else:
+            parts.append(re.escape(char))
+    return re.compile(''.join(parts), re.DOTALL)
+
+
+class _Batch:
+    """Lookups waiting to be sent to one account/region."""
+    
+    def __init__(self, ec2_client: Any):
+        self.ec2_client = ec2_client
+        self.requests: List[Tuple[str, Future]] = []
+
+
+class InstanceNameBatcher:
+    """
+    Coalesces concurrent instance-name lookups into batched DescribeInstances calls.
+    
+    The first lookup for an account/region opens a batch; the batch is sent
+    once max_delay_ms has passed or max_batch lookups have joined it, whichever
+    comes first. Every caller gets the instances carrying its name tag, or
+    matching it when the name contains EC2 filter wildcards.
+    """
+    
+    def __init__(self,
+                 max_delay_ms: int = 300,
+                 max_batch: int = 200,
+                 states: Sequence[str] = SEARCHABLE_STATES):
+        """
+        Initialize the batcher.
+        
+        Args:
+            max_delay_ms: How long a batch waits for more lookups before it is sent
+            max_batch: Maximum number of names sent in one request
+            states: Instance states to match
+        """
+        if max_delay_ms < 0:
+            raise ValueError(f"max_delay_ms must not be negative, got {max_delay_ms}")
+        if max_batch < 1:
+            raise ValueError(f"max_batch must be at least 1, got {max_batch}")
+        
+        self.max_delay = max_delay_ms / 1000
+        self.max_batch = max_batch
+        self.states = list(states)
+        
+        self._pending: Dict[Tuple[str, str], _Batch] = {}
+        self._lock = threading.Lock()
+        
+        logger.debug(f"InstanceNameBatcher initialized with max_delay={max_delay_ms}ms, max_batch={max_batch}")
+    
+    def lookup(self, ec2_client: Any, account_id: str, region: str, server_name: str) -> Future:
+        """
+        Queue a lookup of instances by name tag.
+        
+        Args:
+            ec2_client: EC2 client for the account/region
+            account_id: AWS account ID the client belongs to
+            region: AWS region the client belongs to
+            server_name: The name tag value to search for
+            
+        Returns:
+            Future resolving to the list of matching instances, or raising the
+            ClientError of the batched request
+        """
+        future: Future = Future()
+        key = (account_id, region)
+        
+        with self._lock:
+            batch = self._pending.get(key)
+            if batch is None:
+                batch = self._pending[key] = _Batch(ec2_client)
+                timer = threading.Timer(self.max_delay, self._flush, args=(key, batch))
+                timer.daemon = True
+                timer.start()
+            batch.requests.append((server_name, future))
+            full = len(batch.requests) >= self.max_batch
+            if full:
+                # Close the batch before releasing the lock so no later lookup joins it
+                del self._pending[key]
+        
+        if full:
+            self._send(key, batch)
+        return future
+    
+    def _flush(self, key: Tuple[str, str], batch: _Batch) -> None:
+        """
+        Send a batch once its delay has passed, unless it was already sent.
+        
+        Args:
+            key: (account_id, region) the batch belongs to
+            batch: The batch to send
+        """
+        with self._lock:
+            if self._pending.get(key) is not batch:
+                # Already sent because it filled up
+                return
+            del self._pending[key]
+        
+        self._send(key, batch)
+    
+    def _send(self, key: Tuple[str, str], batch: _Batch) -> None:
+        """
+        Send a closed batch and hand the results to its callers.
+        
+        Args:
+            key: (account_id, region) the batch belongs to
+            batch: The batch to send, already removed from the pending batches
+        """
+        names = sorted({name for name, _ in batch.requests})
+        matches: Dict[str, List[Dict[str, Any]]] = {name: [] for name in names}
+        
+        # Names with wildcards are matched the way the tag:Name filter matched them
+        patterns: Dict[str, Pattern] = {}
+        for name in names:
+            pattern = _wildcard_pattern(name)
+            if pattern is not None:
+                patterns[name] = pattern
+        
+        logger.debug(f"Sending batched DescribeInstances for {len(names)} names in account {key[0]}, region {key[1]}")
+        
+        try:
+            paginator = batch.ec2_client.get_paginator('describe_instances')
+            pages = paginator.paginate(Filters=[
+                {'Name': 'tag:Name', 'Values': names},
+                {'Name': 'instance-state-name', 'Values': self.states}
+            ])
+            for page in pages:
+                for reservation in page['Reservations']:
+                    for instance in reservation['Instances']:
+                        name = self._name_tag(instance)
+                        if name is None:
+                            continue
+                        if name in matches and name not in patterns:
+                            matches[name].append(instance)
+                        for wildcard, pattern in patterns.items():
+                            if pattern.fullmatch(name):
+                                matches[wildcard].append(instance)
+        except Exception as e:
+            for _, future in batch.requests:
+                future.set_exception(e)
+            return
+        
+        for name, future in batch.requests:
+            future.set_result(matches[name])
+    
+    @staticmethod
+    def _name_tag(instance: Dict[str, Any]) -> Optional[str]:
+        """Return the value of an instance's Name tag, if any."""
+        for tag in instance.get('Tags', ()):
+            if tag['Key'] == 'Name':
+                return tag['Value']
+        return None
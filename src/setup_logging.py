@@ -1,27 +1,67 @@
+import atexit
+import copy
+import functools
 import logging
 import logging.handlers
 import os
+import queue
+import re
 import sys
 import getpass
 import socket
 import json
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
+
+# orjson is optional; it serializes log entries several times faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# LogRecord attributes that are not copied into structured entries as extra fields
+_RESERVED_LOGRECORD_ATTRS = frozenset({
+    'name', 'msg', 'args', 'levelname', 'levelno', 'pathname',
+    'filename', 'module', 'lineno', 'funcName', 'created',
+    'msecs', 'relativeCreated', 'thread', 'threadName',
+    'processName', 'process', 'exc_info', 'exc_text', 'stack_info'
+})
+
+@functools.lru_cache(maxsize=1)
+def _resolve_username() -> str:
+    """Get the current username with proper fallbacks, looked up once."""
+    # Check for the original user if using sudo
+    username = (os.environ.get("SUDO_USER") or 
+               os.environ.get("USER") or 
+               os.environ.get("USERNAME") or 
+               os.environ.get("LOGNAME"))
+    
+    if not username:
+        try:
+            username = getpass.getuser()
+        except Exception:
+            username = "unknown"
+    
+    return username
+
+# The hostname does not change during the life of the process, so look it up once
+_HOSTNAME = socket.gethostname()
+
+@functools.lru_cache(maxsize=1)
+def _static_fields() -> Dict[str, str]:
+    """Get the structured log fields that are the same for every record."""
+    return {'user': _resolve_username(), 'hostname': _HOSTNAME}
 
 class StructuredFormatter(logging.Formatter):
     """Custom formatter that outputs structured logs with audit information."""
     
     def format(self, record):
-        # Get user information
-        username = self._get_username()
-        
         # Create structured log entry
         log_entry = {
             'timestamp': self.formatTime(record, self.datefmt),
             'level': record.levelname,
-            'user': username,
-            'hostname': socket.gethostname(),
-            'process_id': os.getpid(),
+            **_static_fields(),
+            'process_id': record.process,
             'module': record.module,
             'function': record.funcName,
             'line': record.lineno,
@@ -34,59 +74,65 @@ class StructuredFormatter(logging.Formatter):
         
         # Add any extra fields from LogRecord
         for key, value in record.__dict__.items():
-            if key not in ['name', 'msg', 'args', 'levelname', 'levelno', 'pathname', 
-                          'filename', 'module', 'lineno', 'funcName', 'created', 
-                          'msecs', 'relativeCreated', 'thread', 'threadName', 
-                          'processName', 'process', 'exc_info', 'exc_text', 'stack_info']:
+            if key not in _RESERVED_LOGRECORD_ATTRS:
                 log_entry[key] = value
         
+        if orjson is not None:
+            return orjson.dumps(log_entry).decode()
         return json.dumps(log_entry)
+
+class _RecordQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that leaves formatting to the handlers behind the queue."""
     
-    def _get_username(self) -> str:
-        """Get the current username with proper fallbacks."""
-        # Check for the original user if using sudo
-        username = (os.environ.get("SUDO_USER") or 
-                   os.environ.get("USER") or 
-                   os.environ.get("USERNAME") or 
-                   os.environ.get("LOGNAME"))
-        
-        if not username:
-            try:
-                username = getpass.getuser()
-            except Exception:
-                username = "unknown"
-        
-        return username
+    def prepare(self, record):
+        # Merge the arguments now, since they may change before the record is
+        # handled, but keep exc_info so the structured formatter can still
+        # report the exception separately
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+# Listener feeding the file and system log handlers from the queue
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+def _stop_queue_listener() -> None:
+    """Flush queued records to their handlers and stop the listener thread."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+atexit.register(_stop_queue_listener)
+
+# (level, console level, log_file) of the last completed setup_logging call
+_logging_config: Optional[Tuple[int, int, Optional[str]]] = None
 
 class ConsoleFormatter(logging.Formatter):
     """Human-readable formatter for console output."""
     
     def __init__(self):
-        self.username = self._get_username()
+        self.username = _resolve_username()
         super().__init__(
             fmt=f"%(asctime)s - %(levelname)s - {self.username} - %(message)s",
             datefmt="%Y-%m-%d %H:%M:%S"
         )
-    
-    def _get_username(self) -> str:
-        """Get the current username with proper fallbacks."""
-        username = (os.environ.get("SUDO_USER") or 
-                   os.environ.get("USER") or 
-                   os.environ.get("USERNAME") or 
-                   os.environ.get("LOGNAME"))
-        
-        if not username:
-            try:
-                username = getpass.getuser()
-            except Exception:
-                username = "unknown"
-        
-        return username
 
 def setup_logging(log_level: Optional[str] = None, log_file: Optional[str] = None) -> logging.Logger:
     """
     Set up comprehensive logging configuration for CLI automation tool.
     
+    Console output is written directly. File and system log output goes
+    through a queue and is written by a background thread, so callers do not
+    wait on disk or syslog I/O.
+    
+    When no log level is passed or set in AWS_AUTOMATION_LOG_LEVEL and stdout
+    is not a terminal (CI, cron, output piped to a file), the console only
+    shows warnings and errors; the full output still goes to the log file.
+    
+    Calling it again with the same effective levels and log file returns the
+    already configured logger without rebuilding its handlers.
+    
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Custom log file path (optional)
@@ -103,24 +149,34 @@ def setup_logging(log_level: Optional[str] = None, log_file: Optional[str] = Non
         env_level = os.environ.get('AWS_AUTOMATION_LOG_LEVEL', 'INFO')
         level = getattr(logging, env_level.upper(), logging.INFO)
     
+    # Keep non-interactive console output to warnings unless a level was asked for
+    console_level = level
+    level_requested = bool(log_level or os.environ.get('AWS_AUTOMATION_LOG_LEVEL'))
+    if not level_requested and not sys.stdout.isatty():
+        console_level = max(level, logging.WARNING)
+    
     # Create logger
+    global _logging_config
     logger = logging.getLogger('aws-automation-tamer')
+    if _logging_config == (level, console_level, log_file) and logger.handlers:
+        return logger
     logger.setLevel(level)
     
     # Clear any existing handlers
     logger.handlers.clear()
+    _stop_queue_listener()
     
     # Console handler with human-readable format
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(level)
+    console_handler.setLevel(console_level)
     console_handler.setFormatter(ConsoleFormatter())
     logger.addHandler(console_handler)
     
     # File handler with structured logging and rotation
-    log_dir = Path.home() / '.aws-automation-tamer' / 'logs'
     if log_file:
         log_path = Path(log_file)
     else:
+        log_dir = Path.home() / '.aws-automation-tamer' / 'logs'
         log_dir.mkdir(parents=True, exist_ok=True)
         log_path = log_dir / 'aws-automation-tamer.log'
     
@@ -133,16 +189,17 @@ def setup_logging(log_level: Optional[str] = None, log_file: Optional[str] = Non
     )
     file_handler.setLevel(logging.INFO)  # Always log INFO and above to file
     file_handler.setFormatter(StructuredFormatter())
-    logger.addHandler(file_handler)
+    queued_handlers = [file_handler]
     
     # System log handler (for production environments)
+    system_logging_error = None
     try:
         # On macOS, use syslog
         if sys.platform == 'darwin':
             syslog_handler = logging.handlers.SysLogHandler(address='/var/run/syslog')
             syslog_handler.setLevel(logging.WARNING)  # Only warnings and errors to syslog
             syslog_handler.setFormatter(ConsoleFormatter())
-            logger.addHandler(syslog_handler)
+            queued_handlers.append(syslog_handler)
         # On Linux, try to use journald if available, fallback to syslog
         elif sys.platform.startswith('linux'):
             try:
@@ -150,22 +207,35 @@ def setup_logging(log_level: Optional[str] = None, log_file: Optional[str] = Non
                 syslog_handler = journal.JournalHandler()
                 syslog_handler.setLevel(logging.WARNING)
                 syslog_handler.setFormatter(ConsoleFormatter())
-                logger.addHandler(syslog_handler)
+                queued_handlers.append(syslog_handler)
             except ImportError:
                 # Fallback to regular syslog
                 syslog_handler = logging.handlers.SysLogHandler(address='/dev/log')
                 syslog_handler.setLevel(logging.WARNING)
                 syslog_handler.setFormatter(ConsoleFormatter())
-                logger.addHandler(syslog_handler)
+                queued_handlers.append(syslog_handler)
     except Exception as e:
         # If system logging fails, just continue with file and console logging
-        logger.warning(f"Could not set up system logging: {e}")
+        system_logging_error = e
+    
+    # File and system log handlers run on the listener thread
+    global _queue_listener
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(_RecordQueueHandler(log_queue))
+    _queue_listener = logging.handlers.QueueListener(log_queue, *queued_handlers,
+                                                     respect_handler_level=True)
+    _queue_listener.start()
+    
+    if system_logging_error is not None:
+        logger.warning(f"Could not set up system logging: {system_logging_error}")
     
     # Configure third-party loggers
     logging.getLogger("botocore.credentials").setLevel(logging.WARNING)
     logging.getLogger("boto3").setLevel(logging.WARNING)
     logging.getLogger("urllib3").setLevel(logging.WARNING)
     
+    _logging_config = (level, console_level, log_file)
+    
     # Log startup information
     logger.info("AWS Automation Tamer started", extra={
         'action': 'startup',
@@ -176,22 +246,30 @@ def setup_logging(log_level: Optional[str] = None, log_file: Optional[str] = Non
     
     return logger
 
-def _get_version() -> str:
-    """Get the application version."""
+_VERSION_PATTERN = re.compile(r'version\s*=\s*["\']([^"\']+)["\']')
+
+def _compute_version() -> str:
+    """Read the application version from setup.py."""
     try:
         # Try to read from setup.py or version file
         setup_py = Path(__file__).parent.parent / 'setup.py'
         if setup_py.exists():
             with open(setup_py, 'r') as f:
                 content = f.read()
-                import re
-                match = re.search(r'version\s*=\s*["\']([^"\']+)["\']', content)
+                match = _VERSION_PATTERN.search(content)
                 if match:
                     return match.group(1)
     except Exception:
         pass
     return "unknown"
 
+# The version does not change while running, so it is read once at import
+_VERSION = _compute_version()
+
+def _get_version() -> str:
+    """Get the application version."""
+    return _VERSION
+
 def get_logger(name: Optional[str] = None) -> logging.Logger:
     """
     Get a logger instance for the specified module.
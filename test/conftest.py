@@ -0,0 +1,100 @@
+"""
+Shared pytest configuration.
+
+The application modules import each other as top-level packages (ec2, libs),
+so the src directory is put on the import path for the tests. The config
+loader and the interactive confirmation prompt are not part of this tree;
+when they cannot be imported, minimal stand-ins are registered so the modules
+that depend on them can still be tested.
+"""
+
+import importlib
+import sys
+import threading
+import types
+from pathlib import Path
+
+import pytest
+
+SRC_DIR = Path(__file__).resolve().parent.parent / 'src'
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+
+def _install_stub(name, **attributes):
+    """Register a stand-in module under name unless the real one can be imported."""
+    try:
+        importlib.import_module(name)
+    except ImportError:
+        module = types.ModuleType(name)
+        module.__dict__.update(attributes)
+        sys.modules[name] = module
+        package, _, attribute = name.rpartition('.')
+        if package:
+            setattr(importlib.import_module(package), attribute, module)
+
+
+_install_stub('load_config',
+              get_aws_accounts=lambda config: dict(config.get('accounts', {})),
+              get_valid_regions=lambda config: list(config.get('regions', [])))
+_install_stub('libs.get_confirmation',
+              get_confirmation=lambda message: False)
+
+
+class CallLog:
+    """Thread-safe record of the calls a fake AWS client received."""
+
+    def __init__(self):
+        self._calls = []
+        self._lock = threading.Lock()
+
+    def record(self, **params):
+        with self._lock:
+            self._calls.append(params)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._calls)
+
+    def __getitem__(self, index):
+        with self._lock:
+            return self._calls[index]
+
+
+def _run_concurrently(func, items, timeout=10):
+    """
+    Call func(item) for every item, each in its own thread, all released at once.
+    
+    Returns the outcomes in item order: the return value, or the exception
+    the call raised.
+    """
+    items = list(items)
+    outcomes = [None] * len(items)
+    barrier = threading.Barrier(len(items))
+
+    def call(index, item):
+        barrier.wait()
+        try:
+            outcomes[index] = func(item)
+        except Exception as e:
+            outcomes[index] = e
+
+    threads = [threading.Thread(target=call, args=(i, item)) for i, item in enumerate(items)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=timeout)
+    assert not any(thread.is_alive() for thread in threads), "concurrent callers did not finish"
+    return outcomes
+
+
+@pytest.fixture
+def call_log():
+    """A fresh CallLog for a fake client."""
+    return CallLog()
+
+
+@pytest.fixture
+def run_concurrently():
+    """Helper that runs one call per item from several threads at once."""
+    return _run_concurrently
@@ -0,0 +1,117 @@
+"""
+Tests for concurrent role assumption in the session manager.
+"""
+
+import datetime
+import threading
+import time
+
+import pytest
+from botocore.exceptions import ClientError
+
+import libs.aws_session_manager as aws_session_manager
+from libs.aws_session_manager import AssumeRoleError, AssumeRoleSessionManager
+
+ACCOUNT_ID = '123456789012'
+REGION = 'eu-west-1'
+THREADS = 5
+
+
+class FakeSTS:
+    """STS client whose assume_role is slow enough for callers to overlap."""
+
+    def __init__(self, calls, delay=0.2, error=None, denied_roles=()):
+        self.calls = calls
+        self.delay = delay
+        self.error = error
+        self.denied_roles = denied_roles
+        self.started = threading.Event()
+
+    def assume_role(self, **params):
+        if params['RoleArn'].rsplit('/', 1)[-1] in self.denied_roles:
+            raise ClientError({'Error': {'Code': 'AccessDenied', 'Message': 'denied'}}, 'AssumeRole')
+        self.calls.record(**params)
+        self.started.set()
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        expiration = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1)
+        return {'Credentials': {'AccessKeyId': 'AKIA', 'SecretAccessKey': 'secret',
+                                'SessionToken': 'token', 'Expiration': expiration}}
+
+
+@pytest.fixture
+def fake_sts(monkeypatch, call_log):
+    def install(**kwargs):
+        sts = FakeSTS(call_log, **kwargs)
+        monkeypatch.setattr(aws_session_manager, '_sts_client', lambda region_name, endpoint_url: sts)
+        return sts
+    return install
+
+
+def _assume_concurrently(manager, run_concurrently):
+    """Assume the same role from several threads at once; return sessions and errors."""
+    outcomes = run_concurrently(lambda _: manager.assume_role(ACCOUNT_ID, REGION), range(THREADS))
+    errors = [outcome for outcome in outcomes if isinstance(outcome, Exception)]
+    sessions = [outcome for outcome in outcomes if not isinstance(outcome, Exception)]
+    return sessions, errors
+
+
+def test_concurrent_callers_share_one_sts_call(fake_sts, run_concurrently):
+    sts = fake_sts()
+    manager = AssumeRoleSessionManager(enable_caching=True)
+
+    sessions, errors = _assume_concurrently(manager, run_concurrently)
+
+    assert len(sts.calls) == 1
+    assert not errors
+    assert len(sessions) == THREADS
+    assert all(session is sessions[0] for session in sessions)
+
+
+def test_failure_reaches_every_waiting_caller(fake_sts, run_concurrently):
+    error = ClientError({'Error': {'Code': 'AccessDenied', 'Message': 'denied'}}, 'AssumeRole')
+    sts = fake_sts(error=error)
+    manager = AssumeRoleSessionManager(enable_caching=True)
+
+    sessions, errors = _assume_concurrently(manager, run_concurrently)
+
+    assert len(sts.calls) == 1
+    assert not sessions
+    assert len(errors) == THREADS
+    assert all(isinstance(e.original_error, ClientError) for e in errors)
+
+
+def test_failure_is_not_cached(fake_sts):
+    error = ClientError({'Error': {'Code': 'Throttling', 'Message': 'slow down'}}, 'AssumeRole')
+    sts = fake_sts(delay=0, error=error)
+    manager = AssumeRoleSessionManager(enable_caching=True)
+
+    with pytest.raises(AssumeRoleError):
+        manager.assume_role(ACCOUNT_ID, REGION)
+    sts.error = None
+
+    assert manager.assume_role(ACCOUNT_ID, REGION) is not None
+    assert len(sts.calls) == 2
+
+
+def test_fallback_inside_except_block_does_not_leak_to_waiters(fake_sts, run_concurrently):
+    sts = fake_sts(denied_roles=('bad',))
+    manager = AssumeRoleSessionManager(enable_caching=True)
+    results = {}
+
+    def leader():
+        try:
+            manager.assume_role(ACCOUNT_ID, REGION, 'bad')
+        except AssumeRoleError:
+            # Falls back while the first failure is still being handled
+            results['leader'] = manager.assume_role(ACCOUNT_ID, REGION, 'good')
+
+    leader_thread = threading.Thread(target=leader)
+    leader_thread.start()
+    assert sts.started.wait(timeout=5)
+    waiters = run_concurrently(lambda _: manager.assume_role(ACCOUNT_ID, REGION, 'good'), range(THREADS))
+    leader_thread.join(timeout=10)
+
+    assert len(sts.calls) == 1
+    assert all(session is results['leader'] for session in waiters)
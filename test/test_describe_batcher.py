@@ -0,0 +1,114 @@
+"""
+Tests for the DescribeInstances request batcher.
+"""
+
+import time
+
+import pytest
+from botocore.exceptions import ClientError
+
+from libs.describe_batcher import InstanceNameBatcher
+
+
+def _instance(instance_id, name):
+    return {'InstanceId': instance_id, 'Tags': [{'Key': 'Name', 'Value': name}]}
+
+
+class FakeEC2:
+    """Minimal EC2 client whose describe_instances paginator returns fixed instances."""
+
+    def __init__(self, instances, calls, error=None):
+        self.instances = instances
+        self.calls = calls
+        self.error = error
+
+    def get_paginator(self, operation):
+        assert operation == 'describe_instances'
+        return self
+
+    def paginate(self, **kwargs):
+        self.calls.record(**kwargs)
+        if self.error is not None:
+            raise self.error
+        return [{'Reservations': [{'Instances': self.instances}]}]
+
+
+def _lookup(batcher, ec2):
+    """Return a function looking up one name in the test account/region."""
+    return lambda name: batcher.lookup(ec2, '123456789012', 'eu-west-1', name)
+
+
+def test_concurrent_lookups_share_one_call(call_log, run_concurrently):
+    ec2 = FakeEC2([_instance('i-1', 'web'), _instance('i-2', 'db'), _instance('i-3', 'cache')], call_log)
+    names = ['web', 'db', 'nope', 'web']
+    # A full batch is sent at once, so the test does not depend on the delay
+    batcher = InstanceNameBatcher(max_delay_ms=60000, max_batch=len(names))
+
+    futures = run_concurrently(_lookup(batcher, ec2), names)
+    results = [future.result(timeout=5) for future in futures]
+
+    assert len(ec2.calls) == 1
+    assert ec2.calls[0]['Filters'][0] == {'Name': 'tag:Name', 'Values': ['db', 'nope', 'web']}
+    assert [[i['InstanceId'] for i in result] for result in results] == [['i-1'], ['i-2'], [], ['i-1']]
+
+
+def test_lookups_are_sent_after_the_delay(call_log):
+    ec2 = FakeEC2([_instance('i-1', 'web')], call_log)
+    batcher = InstanceNameBatcher(max_delay_ms=10)
+
+    future = batcher.lookup(ec2, '123456789012', 'eu-west-1', 'web')
+
+    assert [i['InstanceId'] for i in future.result(timeout=5)] == ['i-1']
+    assert len(ec2.calls) == 1
+
+
+def test_failed_call_reaches_every_caller(call_log, run_concurrently):
+    error = ClientError({'Error': {'Code': 'RequestLimitExceeded'}}, 'DescribeInstances')
+    ec2 = FakeEC2([], call_log, error=error)
+    names = ['web', 'db', 'cache']
+    batcher = InstanceNameBatcher(max_delay_ms=60000, max_batch=len(names))
+
+    futures = run_concurrently(_lookup(batcher, ec2), names)
+
+    assert len(ec2.calls) == 1
+    for future in futures:
+        with pytest.raises(ClientError):
+            future.result(timeout=5)
+
+
+def test_wildcard_names_match_like_the_tag_filter(call_log, run_concurrently):
+    ec2 = FakeEC2([_instance('i-1', 'web-01'), _instance('i-2', 'web-02'),
+                   _instance('i-3', 'web-*'), _instance('i-4', 'db')], call_log)
+    names = ['web-*', 'web-0?', 'web-\\*', 'db']
+    batcher = InstanceNameBatcher(max_delay_ms=60000, max_batch=len(names))
+
+    futures = run_concurrently(_lookup(batcher, ec2), names)
+    results = {name: [i['InstanceId'] for i in future.result(timeout=5)]
+               for name, future in zip(names, futures)}
+
+    assert results == {
+        'web-*': ['i-1', 'i-2', 'i-3'],
+        'web-0?': ['i-1', 'i-2'],
+        'web-\\*': ['i-3'],
+        'db': ['i-4'],
+    }
+
+
+class SlowSendBatcher(InstanceNameBatcher):
+    """Batcher that takes a while to start sending, so late lookups overlap the send."""
+
+    def _send(self, key, batch):
+        time.sleep(0.05)
+        super()._send(key, batch)
+
+
+def test_full_batch_does_not_take_more_lookups(call_log, run_concurrently):
+    ec2 = FakeEC2([_instance(f'i-{n}', f'web-{n}') for n in range(6)], call_log)
+    names = [f'web-{n}' for n in range(6)]
+    batcher = SlowSendBatcher(max_delay_ms=60000, max_batch=3)
+
+    futures = run_concurrently(_lookup(batcher, ec2), names)
+    results = [[i['InstanceId'] for i in future.result(timeout=5)] for future in futures]
+
+    assert [len(call['Filters'][0]['Values']) for call in ec2.calls] == [3, 3]
+    assert results == [[f'i-{n}'] for n in range(6)]
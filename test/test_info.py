@@ -0,0 +1,100 @@
+"""
+Tests for the instance info table.
+
+The expected tables pin the grid format the info command prints, so changes
+to the renderer show up as an explicit diff here.
+"""
+
+import datetime
+
+from ec2.info import _render_grid, format_instance_info
+
+INSTANCE = {
+    'InstanceId': 'i-0123456789abcdef0',
+    'InstanceType': 't3.micro',
+    'State': {'Name': 'running'},
+    'LaunchTime': datetime.datetime(2024, 1, 2, 3, 4, 5),
+    'VpcId': 'vpc-1',
+    'SubnetId': 'subnet-1',
+    'Placement': {'AvailabilityZone': 'eu-central-1a'},
+    'PrivateIpAddress': '10.0.0.1',
+    'SecurityGroups': [{'GroupName': 'web', 'GroupId': 'sg-1'}],
+    'Tags': [
+        {'Key': 'Name', 'Value': 'web-01'},
+        {'Key': 'Owner', 'Value': 'ops'},
+        {'Key': 'Team', 'Value': 'platform'},
+    ],
+    'KeyName': 'k',
+    'RootDeviceName': '/dev/xvda',
+    'RootDeviceType': 'ebs',
+    'BlockDeviceMappings': [{'DeviceName': '/dev/xvda', 'Ebs': {'VolumeId': 'vol-1'}}],
+    'Monitoring': {'State': 'disabled'},
+    'Architecture': 'x86_64',
+}
+
+EXPECTED_INSTANCE_TABLE = """\
++-------------------+-------------------------+
+| Property          | Value                   |
++===================+=========================+
+| Account           | prod                    |
++-------------------+-------------------------+
+| Region            | eu-central-1            |
++-------------------+-------------------------+
+| Availability Zone | eu-central-1a           |
++-------------------+-------------------------+
+| Instance ID       | i-0123456789abcdef0     |
++-------------------+-------------------------+
+| Instance Type     | t3.micro                |
++-------------------+-------------------------+
+| State             | RUNNING                 |
++-------------------+-------------------------+
+| Launch Time       | 2024-01-02 03:04:05 UTC |
++-------------------+-------------------------+
+| Platform          | Linux/Unix              |
++-------------------+-------------------------+
+| Architecture      | x86_64                  |
++-------------------+-------------------------+
+| VPC ID            | vpc-1                   |
++-------------------+-------------------------+
+| Subnet ID         | subnet-1                |
++-------------------+-------------------------+
+| Private IP        | 10.0.0.1                |
++-------------------+-------------------------+
+| Public IP         | N/A                     |
++-------------------+-------------------------+
+| Key Pair          | k                       |
++-------------------+-------------------------+
+| Security Groups   | web (sg-1)              |
++-------------------+-------------------------+
+| Root Device       | /dev/xvda (ebs)         |
++-------------------+-------------------------+
+| Block Devices     | /dev/xvda: vol-1        |
++-------------------+-------------------------+
+| Monitoring        | disabled                |
++-------------------+-------------------------+
+| Tag: Name         | web-01                  |
++-------------------+-------------------------+
+| Tag: Owner        | ops                     |
++-------------------+-------------------------+
+| Other Tags        | Team=platform           |
++-------------------+-------------------------+"""
+
+EXPECTED_WRAPPED_TABLE = """\
++------------+----------------------------------------------------+
+| Property   | Value                                              |
++============+====================================================+
+| Other Tags | alpha=1, beta=two-words-hyphenated-value, gamma=3, |
+|            | delta=a-very-long-value-without-spaces-            |
+|            | xxxxxxxxxxxxxxxxxxxxxxxx                           |
++------------+----------------------------------------------------+"""
+
+
+def test_format_instance_info_matches_golden_table():
+    assert format_instance_info(INSTANCE, 'prod', 'eu-central-1') == EXPECTED_INSTANCE_TABLE
+
+
+def test_render_grid_wraps_long_values():
+    value = ('alpha=1, beta=two-words-hyphenated-value, gamma=3, '
+             'delta=a-very-long-value-without-spaces-xxxxxxxxxxxxxxxxxxxxxxxx')
+    table = _render_grid([['Other Tags', value]], ['Property', 'Value'], max_widths=[25, 50])
+    assert table == EXPECTED_WRAPPED_TABLE